@@ -0,0 +1,364 @@
+"""
+Keystroke to action latency for ShortcutManager, no desktop needed
+
+ex: python -m benchmarks.shortcut_latency --out bench.json
+    python -m benchmarks.shortcut_latency --counts 10 1000 --compare bench.json
+
+Replays synthetic chords through a FakeBackend and a headless manager, then
+    writes p50/p99 per-key latency, throughput and allocations as JSON.
+    --metrics adds the manager's own per stage breakdown
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import threading
+import tracemalloc
+
+from datetime import datetime
+from itertools import product
+from statistics import quantiles
+from time import perf_counter_ns
+
+from lib.Shortcuts.InputBackend import FakeBackend
+from lib.Shortcuts.Shortcut import Shortcut
+from lib.Shortcuts.ShortcutManager import ManagerOptions, ShortcutManager
+
+
+CMD_KEY = "ctrl+up"
+KEYS = [*"abcdefghijklmnopqrstuvwxyz0123456789"]
+
+# How many different prefixes the shared part of a path is drawn from
+SHARED_PREFIXES = 4
+
+# Keys traced with tracemalloc, it's slow so we only sample
+ALLOCATION_SAMPLE_KEYS = 200
+
+ACTION_TIMEOUT_SECONDS = 5
+
+
+class BenchConfig:
+    count: int
+    depth: int
+    sharing: float
+    requireFullPath: bool
+    hookMode: str
+
+    def __init__(
+        self,
+        count: int,
+        depth: int,
+        sharing: float,
+        requireFullPath: bool,
+        hookMode: str,
+    ):
+        self.count = count
+        self.depth = depth
+        self.sharing = sharing
+        self.requireFullPath = requireFullPath
+        self.hookMode = hookMode
+
+    def asDict(self):
+        return {
+            "count": self.count,
+            "depth": self.depth,
+            "sharing": self.sharing,
+            "requireFullPath": self.requireFullPath,
+            "hookMode": self.hookMode,
+        }
+
+    def key(self):
+        return tuple(self.asDict().values())
+
+    def __repr__(self):
+        return f"BenchConfig({", ".join(f"{k}={v}" for k, v in self.asDict().items())})"
+
+
+def keysFor(index: int, length: int) -> list[str]:
+    # Index in base len(KEYS), padded out to length
+    keys = []
+    for _ in range(length):
+        index, digit = divmod(index, len(KEYS))
+        keys.append(KEYS[digit])
+
+    return keys
+
+
+def generatePaths(config: BenchConfig, rng: random.Random) -> list[list[str]] | None:
+    """
+    Every path is config.depth keys long, the first sharing * depth keys come
+        from a handful of distinct shared prefixes and the rest is a unique suffix
+
+    Returns None when the suffix can't be unique for that many shortcuts
+    """
+
+    sharedLength = round(config.sharing * config.depth)
+    suffixLength = config.depth - sharedLength
+
+    # Drawn without replacement, two equal prefixes would make duplicate paths
+    prefixSpace = len(KEYS) ** sharedLength
+    prefixes = [
+        keysFor(index, sharedLength)
+        for index in rng.sample(range(prefixSpace), min(SHARED_PREFIXES, prefixSpace))
+    ]
+    suffixSpace = len(KEYS) ** suffixLength
+
+    if len(prefixes) * suffixSpace < config.count:
+        return None
+
+    paths = []
+    for index in rng.sample(range(len(prefixes) * suffixSpace), config.count):
+        prefix, suffix = divmod(index, suffixSpace)
+        paths.append(prefixes[prefix] + keysFor(suffix, suffixLength))
+
+    return paths
+
+
+def percentile(samples: list[int], at: int):
+    if len(samples) < 2:
+        return samples[0] if samples else 0
+
+    return quantiles(samples, n=100, method="inclusive")[at - 1]
+
+
+def summarize(samples: list[int]):
+    return {
+        "p50": percentile(samples, 50),
+        "p99": percentile(samples, 99),
+        "max": max(samples, default=0),
+        "samples": len(samples),
+    }
+
+
+def runConfig(config: BenchConfig, chords: int, seed: int, metrics: bool = False):
+    rng = random.Random(seed)
+
+    paths = generatePaths(config, rng)
+    if paths is None:
+        return {**config.asDict(), "skipped": "not enough unique paths for depth"}
+
+    backend = FakeBackend(record=False)
+    manager = ShortcutManager(
+        CMD_KEY,
+        backend=backend,
+        options=ManagerOptions(
+            addDummyShortcut=False,
+            requireFullPath=config.requireFullPath,
+            hookMode=config.hookMode,
+            headless=True,
+            metrics=metrics,
+        ),
+    )
+
+    # Worker and scheduler threads would pile up across configs and skew the later ones
+    try:
+        # Shortcuts run off the hook thread, so they tell us when they're done
+        ranAt = [0]
+        ran = threading.Event()
+
+        def onRun():
+            ranAt[0] = perf_counter_ns()
+            ran.set()
+
+        buildStart = perf_counter_ns()
+        for path in paths:
+            manager.addShortcut(Shortcut(path, onRun))
+        buildNs = perf_counter_ns() - buildStart
+
+        keyLatencies: list[int] = []
+        actionLatencies: list[int] = []
+        keyCount = 0
+
+        replayStart = perf_counter_ns()
+        for _ in range(chords):
+            path = rng.choice(paths)
+            ran.clear()
+
+            for step, key in enumerate([CMD_KEY, *path]):
+                start = perf_counter_ns()
+                backend.tap(key)
+                keyLatencies.append(perf_counter_ns() - start)
+                keyCount += 1
+
+                if step and chordFinished(manager):
+                    break
+
+            if not ran.wait(ACTION_TIMEOUT_SECONDS):
+                raise RuntimeError(f"{config} never ran '{"".join(path)}'")
+
+            actionLatencies.append(ranAt[0] - start)
+        replayNs = perf_counter_ns() - replayStart
+
+        # Taken before measureAllocations replays more keys into it
+        stages = manager.metrics.snapshot() if manager.metrics else None
+
+        return {
+            **config.asDict(),
+            "buildMs": buildNs / 1e6,
+            "keyLatencyNs": summarize(keyLatencies),
+            "actionLatencyNs": summarize(actionLatencies),
+            "keysPerSecond": keyCount / (replayNs / 1e9),
+            "allocations": measureAllocations(manager, backend, paths, rng, ran),
+            **({"metrics": stages} if stages else {}),
+        }
+    finally:
+        manager.shutdown()
+
+
+def chordFinished(manager: ShortcutManager):
+    # Back at the root after a path key means the shortcut was found
+    return manager.currentNode is manager.pathIndex.root
+
+
+def measureAllocations(
+    manager: ShortcutManager,
+    backend: FakeBackend,
+    paths: list[list[str]],
+    rng: random.Random,
+    ran: threading.Event,
+):
+    """
+    Bytes and blocks left behind plus the transient peak, per replayed key
+    """
+
+    keyCount = 0
+    peaks: list[int] = []
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    while keyCount < ALLOCATION_SAMPLE_KEYS:
+        ran.clear()
+
+        for step, key in enumerate([CMD_KEY, *rng.choice(paths)]):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+
+            backend.tap(key)
+
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+            keyCount += 1
+
+            if step and chordFinished(manager):
+                break
+
+        ran.wait(ACTION_TIMEOUT_SECONDS)
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = after.compare_to(before, "filename")
+
+    return {
+        "keys": keyCount,
+        "peakBytesPerKey": summarize(peaks),
+        "retainedBytesPerKey": sum(stat.size_diff for stat in retained) / keyCount,
+        "retainedBlocksPerKey": sum(stat.count_diff for stat in retained) / keyCount,
+    }
+
+
+def gitCommit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(previousPath: str, results: list[dict]):
+    with open(previousPath) as file:
+        previous = json.load(file)
+
+    previousByConfig = {
+        BenchConfig(**{k: r[k] for k in BenchConfig.__annotations__}).key(): r
+        for r in previous["results"]
+        if "skipped" not in r
+    }
+
+    print(f"\nCompared to {previous.get("commit")}")
+    for result in results:
+        config = BenchConfig(**{k: result[k] for k in BenchConfig.__annotations__})
+        old = previousByConfig.get(config.key())
+
+        if "skipped" in result or not old:
+            continue
+
+        ratios = [
+            f"{stat} {metric} x{result[metric][stat] / max(old[metric][stat], 1):.2f}"
+            for metric in ("keyLatencyNs", "actionLatencyNs")
+            for stat in ("p50", "p99")
+        ]
+        print(f"{config}: {", ".join(ratios)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--sharing", type=float, nargs="+", default=[0.0, 0.5])
+    parser.add_argument("--require-full-path", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--hook-modes", nargs="+", default=["hotkey", "hook"])
+    parser.add_argument(
+        "--chords", type=int, default=500, help="chords replayed per config"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_output.json")
+    parser.add_argument("--compare", help="previous results to compare against")
+    parser.add_argument(
+        "--metrics", action="store_true", help="record ManagerOptions(metrics=True) stages"
+    )
+    args = parser.parse_args()
+
+    # Nobody wants f-strings formatted a million times while we time things
+    logging.disable(logging.CRITICAL)
+
+    results = []
+    for count, depth, sharing, requireFullPath, hookMode in product(
+        args.counts, args.depths, args.sharing, args.require_full_path, args.hook_modes
+    ):
+        config = BenchConfig(count, depth, sharing, bool(requireFullPath), hookMode)
+        result = runConfig(config, args.chords, args.seed, args.metrics)
+        results.append(result)
+
+        if "skipped" in result:
+            print(f"{config}: skipped")
+            continue
+
+        print(
+            f"{config}: key p50 {result["keyLatencyNs"]["p50"] / 1e3:.1f}us"
+            f" p99 {result["keyLatencyNs"]["p99"] / 1e3:.1f}us"
+            f", action p50 {result["actionLatencyNs"]["p50"] / 1e3:.1f}us"
+            f", {result["keysPerSecond"]:.0f} keys/s"
+        )
+
+    output = {
+        "commit": gitCommit(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(),
+        "chords": args.chords,
+        "seed": args.seed,
+        "results": results,
+    }
+
+    with open(args.out, "w") as file:
+        json.dump(output, file, indent=2)
+
+    print(f"Wrote {args.out}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
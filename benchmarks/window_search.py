@@ -0,0 +1,134 @@
+"""
+Window search and activation cost on a SimulatedDesktop, no Windows needed
+
+ex: python -m benchmarks.window_search --out windows.json
+    python -m benchmarks.window_search --windows 100 1000 --latency 0 0.00002
+
+Times searchForWindowByTitle, searchForWindowsByTitle, searchForWindowsByTitles,
+    tryActivate and event_windowCreated against N synthetic windows, then writes p50/p99 and
+    backend call counts as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+
+from datetime import datetime
+from itertools import product
+from threading import Event
+from time import perf_counter_ns
+
+from benchmarks.shortcut_latency import gitCommit, summarize
+from lib.WindowManager import SimulatedDesktop, setBackend
+from lib.WindowManager.managers import (
+    WindowQuery,
+    event_windowCreated,
+    searchForWindowByTitle,
+    searchForWindowsByTitle,
+    searchForWindowsByTitles,
+)
+
+
+def timeCalls(call, repeat: int):
+    samples = []
+
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        call()
+        samples.append(perf_counter_ns() - start)
+
+    return summarize(samples)
+
+
+def runConfig(windows: int, latency: float, repeat: int):
+    desktop = SimulatedDesktop(windows=windows, syscallLatency=latency)
+    setBackend(desktop)
+
+    # Last in z-order, worst case for a single search
+    lastTitle = f"Window {windows - 1}"
+    target = searchForWindowByTitle(lastTitle, exact=True)
+    other = searchForWindowByTitle("Window 0", exact=True)
+
+    # Ten targets spread over the z-order, one enumeration for all of them
+    batch = [
+        WindowQuery(f"Window {index}", exact=True, breakOnFirst=True)
+        for index in range(0, windows, max(windows // 10, 1))
+    ]
+
+    def activate():
+        other.tryActivate(tryThreadAttach=False)
+        target.tryActivate(tryThreadAttach=False)
+
+    def windowCreated():
+        found = Event()
+
+        loop = event_windowCreated(
+            lambda _: found.set(), {"keyword": "Late Window", "exact": True}
+        )
+        desktop.addWindow("Late Window")
+        found.wait(5)
+
+        loop.stop()
+        desktop.removeWindow(searchForWindowByTitle("Late Window", exact=True).hwnd)
+
+    results = dict()
+    for name, call in [
+        ("searchLast", lambda: searchForWindowByTitle(lastTitle, exact=True)),
+        ("searchMiss", lambda: searchForWindowByTitle("Not A Window")),
+        ("searchAll", lambda: searchForWindowsByTitle("Window")),
+        ("searchBatch", lambda: searchForWindowsByTitles(batch)),
+        ("tryActivate", activate),
+        ("windowCreated", windowCreated),
+    ]:
+        desktop.calls.clear()
+        results[name] = {
+            "latencyNs": timeCalls(call, repeat),
+            "backendCallsPerRun": {
+                call: count / repeat for call, count in desktop.calls.items()
+            },
+        }
+
+    return {"windows": windows, "syscallLatency": latency, **results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--windows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", default="window_search_output.json")
+    args = parser.parse_args()
+
+    results = []
+    for windows, latency in product(args.windows, args.latency):
+        result = runConfig(windows, latency, args.repeat)
+        results.append(result)
+
+        print(
+            f"windows={windows} latency={latency}: "
+            + ", ".join(
+                f"{name} p50 {result[name]["latencyNs"]["p50"] / 1e3:.1f}us"
+                for name in ("searchLast", "searchMiss", "searchBatch", "tryActivate")
+            )
+        )
+
+    output = {
+        "commit": gitCommit(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    with open(args.out, "w") as file:
+        json.dump(output, file, indent=2)
+
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+
+# backend
+#   - everything the manager and macros need from a keyboard
+#       - hook / unhook, hotkeys, parse, send, press, release, write
+#
+#   - KeyboardBackend is the real deal, wraps BoppreH's keyboard
+#   - FakeBackend lives in memory and replays scripted key streams
+
+
+KEY_DOWN = "down"
+KEY_UP = "up"
+
+type T_ParsedHotkey = tuple[tuple[tuple[int, ...], ...], ...]
+
+
+class KeyEvent:
+    """
+    Same shape as keyboard.KeyboardEvent, for the backends that aren't keyboard
+    """
+
+    event_type: str
+    scan_code: int
+    name: str
+    time: float
+
+    def __init__(self, event_type: str, scan_code: int, name: str, time: float):
+        self.event_type = event_type
+        self.scan_code = scan_code
+        self.name = name
+        self.time = time
+
+    def __repr__(self):
+        return f"KeyEvent({self.event_type}, name='{self.name}', scan_code={self.scan_code}, time={self.time})"
+
+
+class InputBackend:
+    KEY_DOWN = KEY_DOWN
+    KEY_UP = KEY_UP
+
+    def hook(self, callback: Callable[[KeyEvent], bool], suppress: bool = False) -> Any:
+        """
+        Calls back with every key event, returning False from the callback
+            swallows the event when suppress is set
+
+        Returns a handle for unhook
+        """
+        raise NotImplementedError()
+
+    def unhook(self, handle: Any):
+        raise NotImplementedError()
+
+    def addHotkey(self, hotkey: str | T_ParsedHotkey, callback: Callable[[], None]) -> Any:
+        """
+        Returns a handle for removeHotkey
+
+        Pass the hotkey string, keyboard flattens a one-step parsed tuple into
+            a single group and every key in it fires on its own
+        """
+        raise NotImplementedError()
+
+    def removeHotkey(self, handle: Any):
+        raise NotImplementedError()
+
+    def removeAllHotkeys(self):
+        raise NotImplementedError()
+
+    def parseHotkey(self, hotkey: str | T_ParsedHotkey) -> T_ParsedHotkey:
+        raise NotImplementedError()
+
+    def isModifier(self, scanCode: int) -> bool:
+        raise NotImplementedError()
+
+    def send(self, hotkey: str):
+        raise NotImplementedError()
+
+    def press(self, hotkey: str):
+        raise NotImplementedError()
+
+    def release(self, hotkey: str):
+        raise NotImplementedError()
+
+    def write(self, text: str):
+        raise NotImplementedError()
+
+    def wait(self, hotkey: str = None):
+        raise NotImplementedError()
+
+
+class KeyboardBackend(InputBackend):
+    def __init__(self):
+        # Imported here so the fake can be used where keyboard can't
+        import keyboard
+
+        self.keyboard = keyboard
+
+    def hook(self, callback: Callable[[KeyEvent], bool], suppress: bool = False):
+        return self.keyboard.hook(callback, suppress=suppress)
+
+    def unhook(self, handle: Any):
+        self.keyboard.unhook(handle)
+
+    def addHotkey(self, hotkey: str | T_ParsedHotkey, callback: Callable[[], None]):
+        return self.keyboard.add_hotkey(hotkey, callback)
+
+    def removeHotkey(self, handle: Any):
+        self.keyboard.remove_hotkey(handle)
+
+    def removeAllHotkeys(self):
+        self.keyboard.remove_all_hotkeys()
+
+    def parseHotkey(self, hotkey: str | T_ParsedHotkey):
+        return self.keyboard.parse_hotkey(hotkey)
+
+    def isModifier(self, scanCode: int):
+        return self.keyboard.is_modifier(scanCode)
+
+    def send(self, hotkey: str):
+        self.keyboard.send(hotkey)
+
+    def press(self, hotkey: str):
+        self.keyboard.press(hotkey)
+
+    def release(self, hotkey: str):
+        self.keyboard.release(hotkey)
+
+    def write(self, text: str):
+        self.keyboard.write(text)
+
+    def wait(self, hotkey: str = None):
+        self.keyboard.wait(hotkey)
+
+
+class FakeBackend(InputBackend):
+    """
+    Deterministic, in memory, no desktop required
+
+    ex: backend = FakeBackend()
+        manager = ShortcutManager("ctrl+up", backend=backend, options=ManagerOptions(headless=True))
+        backend.replay([(0.0, "ctrl", KEY_DOWN), (0.0, "up", KEY_DOWN), ...])
+
+    Scan codes are handed out the first time a key name is seen, modifiers get
+        a left and a right code like they do in keyboard
+    """
+
+    MODIFIERS = {
+        "ctrl": ("left ctrl", "right ctrl"),
+        "shift": ("left shift", "right shift"),
+        "alt": ("left alt", "right alt"),
+        "windows": ("left windows", "right windows"),
+    }
+
+    scanCodes: dict[str, int]
+    names: dict[int, str]
+    modifierCodes: set[int]
+
+    hooks: dict[int, tuple[Callable[[KeyEvent], bool], bool]]
+    hotkeys: dict[int, tuple[T_ParsedHotkey, Callable[[], None]]]
+    pressed: set[int]
+
+    # (time, action, value) for send/press/release/write, when recording
+    output: list[tuple[float, str, str]]
+    # Events that made it past every hook
+    passed: list[KeyEvent]
+
+    def __init__(self, record: bool = True):
+        self.record = record
+        self.time = 0.0
+
+        self.scanCodes = dict()
+        self.names = dict()
+        self.modifierCodes = set()
+
+        self.hooks = dict()
+        self.hotkeys = dict()
+        self.pressed = set()
+        self.nextHandle = 0
+
+        self.output = list()
+        self.passed = list()
+
+        for sides in self.MODIFIERS.values():
+            for side in sides:
+                self.modifierCodes.add(self.scanCodeFor(side))
+
+    def scanCodeFor(self, name: str) -> int:
+        code = self.scanCodes.get(name)
+        if code is None:
+            code = self.scanCodes[name] = len(self.scanCodes) + 1
+            self.names[code] = name
+
+        return code
+
+    def __keyToScanCodes(self, name: str) -> tuple[int, ...]:
+        name = name.strip().lower()
+
+        sides = self.MODIFIERS.get(name)
+        if sides:
+            return tuple(self.scanCodeFor(side) for side in sides)
+
+        return (self.scanCodeFor(name),)
+
+    def __flatScanCodes(self, key: str | int | tuple) -> tuple[int, ...]:
+        if isinstance(key, int):
+            return (key,)
+
+        if isinstance(key, (list, tuple)):
+            return sum((self.__flatScanCodes(item) for item in key), ())
+
+        return self.__keyToScanCodes(key)
+
+    def __handle(self):
+        self.nextHandle += 1
+        return self.nextHandle
+
+    def hook(self, callback: Callable[[KeyEvent], bool], suppress: bool = False):
+        handle = self.__handle()
+        self.hooks[handle] = (callback, suppress)
+        return handle
+
+    def unhook(self, handle: Any):
+        self.hooks.pop(handle, None)
+
+    def addHotkey(self, hotkey: str | T_ParsedHotkey, callback: Callable[[], None]):
+        handle = self.__handle()
+        self.hotkeys[handle] = (self.parseHotkey(hotkey), callback)
+        return handle
+
+    def removeHotkey(self, handle: Any):
+        if self.hotkeys.pop(handle, None) is None:
+            raise ValueError(f"No hotkey for handle: {handle}")
+
+    def removeAllHotkeys(self):
+        self.hotkeys = dict()
+
+    def parseHotkey(self, hotkey: str | T_ParsedHotkey):
+        # Same rules as keyboard.parse_hotkey, including what it does to something
+        #   already parsed: a single step gets flattened into one group of keys
+        if isinstance(hotkey, int) or len(hotkey) == 1:
+            return ((self.__flatScanCodes(hotkey),),)
+
+        if isinstance(hotkey, (list, tuple)):
+            if not any(isinstance(key, (list, tuple)) for key in hotkey):
+                return (tuple(self.__flatScanCodes(key) for key in hotkey),)
+
+            return hotkey
+
+        return tuple(
+            tuple(self.__keyToScanCodes(key) for key in step.split("+"))
+            for step in hotkey.split(", ")
+        )
+
+    def isModifier(self, scanCode: int):
+        return scanCode in self.modifierCodes
+
+    def __record(self, action: str, value: str):
+        if self.record:
+            self.output.append((self.time, action, value))
+
+    def send(self, hotkey: str):
+        self.__record("send", hotkey)
+
+    def press(self, hotkey: str):
+        self.__record("press", hotkey)
+
+    def release(self, hotkey: str):
+        self.__record("release", hotkey)
+
+    def write(self, text: str):
+        self.__record("write", text)
+
+    def wait(self, hotkey: str = None):
+        # Nothing is ever coming, don't block the caller forever
+        return
+
+    def __hotkeyMatches(self, parsed: T_ParsedHotkey, scanCode: int):
+        # Multi-step hotkeys aren't needed by the manager, only the first step counts
+        *modifiers, trigger = parsed[0]
+
+        if scanCode not in trigger:
+            return False
+
+        if not all(any(code in self.pressed for code in group) for group in modifiers):
+            return False
+
+        # Nothing else held down, like keyboard's exact match
+        wanted = {code for group in parsed[0] for code in group}
+        return all(code in wanted for code in self.pressed)
+
+    def feed(self, name: str, eventType: str = KEY_DOWN, time: float = None) -> bool:
+        """
+        Pushes one event through the hooks and hotkeys
+
+        Returns False if a hook swallowed it
+        """
+
+        if time is not None:
+            self.time = time
+
+        # "ctrl" and friends come in as the left side
+        scanCode = self.__keyToScanCodes(name)[0]
+        event = KeyEvent(eventType, scanCode, name, self.time)
+
+        if eventType == KEY_DOWN:
+            self.pressed.add(scanCode)
+        else:
+            self.pressed.discard(scanCode)
+
+        # Callbacks add and remove registrations, so walk a snapshot
+        passed = True
+        for callback, suppress in list(self.hooks.values()):
+            if callback(event) == False and suppress:
+                passed = False
+
+        if eventType == KEY_DOWN:
+            for parsed, callback in list(self.hotkeys.values()):
+                if self.__hotkeyMatches(parsed, scanCode):
+                    callback()
+
+        if passed and self.record:
+            self.passed.append(event)
+
+        return passed
+
+    def tap(self, hotkey: str, time: float = None):
+        """
+        Presses every key in the hotkey in order, then releases them backwards
+        """
+
+        keys = [self.names[group[0]] for group in self.parseHotkey(hotkey)[0]]
+
+        for key in keys:
+            self.feed(key, KEY_DOWN, time)
+
+        for key in reversed(keys):
+            self.feed(key, KEY_UP, time)
+
+    def replay(self, events: Iterable[tuple[float, str, str]]):
+        """
+        events: (timestamp, key name, KEY_DOWN | KEY_UP)
+        """
+
+        for time, name, eventType in events:
+            self.feed(name, eventType, time)
+
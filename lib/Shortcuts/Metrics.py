@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from time import perf_counter_ns
+from typing import Literal
+
+
+# metrics
+#   - one ring buffer of nanosecond samples per stage, allocated up front
+#       - the newest `capacity` samples, percentiles come from these
+#       - a histogram and totals that cover every sample ever recorded
+#   - counters for things that happen, not how long they take
+#   - off by default, ShortcutManager only touches this when options.metrics is set
+
+type T_Stage = Literal[
+    "hook", "pathFilter", "rehook", "activation", "guiDispatch", "runnable"
+]
+
+STAGES: tuple[T_Stage, ...] = (
+    # Whole hook callback, from the backend calling us to returning
+    "hook",
+    # Stepping the path index and checking for a single shortcut
+    "pathFilter",
+    # Swapping hotkeys / the hook table for the next step
+    "rehook",
+    # Bringing the target window back before running
+    "activation",
+    # Posting entry / help / visibility updates to the window
+    "guiDispatch",
+    # The shortcut itself
+    "runnable",
+)
+
+# Upper bounds, anything over the last one goes in the overflow bucket
+HISTOGRAM_BOUNDS_NS = (
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    25_000,
+    50_000,
+    100_000,
+    250_000,
+    500_000,
+    1_000_000,
+    10_000_000,
+    100_000_000,
+    1_000_000_000,
+)
+
+
+def boundLabel(bound: int):
+    for unit, size in (("s", 1_000_000_000), ("ms", 1_000_000), ("us", 1_000)):
+        if bound >= size:
+            return f"<={bound / size:g}{unit}"
+
+    return f"<={bound}ns"
+
+
+class StageTimings:
+    __slots__ = ("samples", "index", "count", "totalNs", "maxNs", "histogram")
+
+    samples: array
+    index: int
+    count: int
+    totalNs: int
+    maxNs: int
+    histogram: array
+
+    def __init__(self, capacity: int):
+        self.samples = array("q", bytes(8 * capacity))
+        self.histogram = array("Q", bytes(8 * (len(HISTOGRAM_BOUNDS_NS) + 1)))
+        self.reset()
+
+    def reset(self):
+        self.index = 0
+        self.count = 0
+        self.totalNs = 0
+        self.maxNs = 0
+
+        for bucket in range(len(self.histogram)):
+            self.histogram[bucket] = 0
+
+    def record(self, ns: int):
+        # Racing threads can lose a sample here, not worth a lock on the hot path
+        self.samples[self.index] = ns
+        self.index = (self.index + 1) % len(self.samples)
+
+        self.count += 1
+        self.totalNs += ns
+        if ns > self.maxNs:
+            self.maxNs = ns
+
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS_NS, ns)] += 1
+
+    def snapshot(self):
+        recent = sorted(self.samples[: min(self.count, len(self.samples))])
+
+        def at(percent: int):
+            if not recent:
+                return 0
+
+            return recent[min(len(recent) * percent // 100, len(recent) - 1)]
+
+        return {
+            "count": self.count,
+            "totalNs": self.totalNs,
+            "meanNs": self.totalNs / self.count if self.count else 0,
+            "maxNs": self.maxNs,
+            # Percentiles only cover the samples still in the ring
+            "p50Ns": at(50),
+            "p90Ns": at(90),
+            "p99Ns": at(99),
+            "histogram": {
+                **{
+                    boundLabel(bound): self.histogram[bucket]
+                    for bucket, bound in enumerate(HISTOGRAM_BOUNDS_NS)
+                },
+                "overflow": self.histogram[-1],
+            },
+        }
+
+
+class Metrics:
+    """
+    Per stage timings and counters for a ShortcutManager
+
+    ex: manager = ShortcutManager("ctrl+up", options=ManagerOptions(metrics=True))
+        ...
+        manager.metrics.snapshot()["stages"]["hook"]["p99Ns"]
+        manager.metrics.export("metrics.json")
+    """
+
+    capacity: int
+    stages: dict[T_Stage, StageTimings]
+    counters: Counter
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.stages = {stage: StageTimings(capacity) for stage in STAGES}
+        self.counters = Counter()
+
+    @staticmethod
+    def now():
+        return perf_counter_ns()
+
+    def record(self, stage: T_Stage, startNs: int):
+        """
+        startNs is what now() returned when the stage started
+        """
+
+        self.stages[stage].record(perf_counter_ns() - startNs)
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def reset(self):
+        for timings in self.stages.values():
+            timings.reset()
+
+        self.counters.clear()
+
+    def snapshot(self):
+        return {
+            "capacity": self.capacity,
+            "stages": {stage: timings.snapshot() for stage, timings in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+    def export(self, path: str = None) -> str:
+        """
+        The snapshot as JSON, written to path if there is one
+        """
+
+        exported = json.dumps(self.snapshot(), indent=2)
+
+        if path:
+            with open(path, "w") as file:
+                file.write(exported)
+
+        return exported
+
+    def __repr__(self):
+        return f"Metrics(capacity={self.capacity}, counters={dict(self.counters)})"
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+
+from typing import Iterable, Iterator
+
+from lib.Shortcuts.Shortcut import Shortcut
+
+
+# index
+#   - one node per key prefix
+#       - children keyed by the next key in the path
+#       - terminals are the shortcuts that end on this node
+#       - count is how many shortcuts live under this node
+#
+#   - keypress is a single child lookup
+#   - valid continuations are just the children keys
+#
+#   - copyWith never touches the index it's called on
+#       - nodes along a changed path are copied, everything else is shared
+#       - so a chord halfway down the old index can finish there
+
+
+class PathNode:
+    __slots__ = ("children", "terminals", "count")
+
+    children: dict[str, PathNode]
+    terminals: list[Shortcut]
+    count: int
+
+    def __init__(self):
+        self.children = dict()
+        self.terminals = list()
+        self.count = 0
+
+    def copy(self) -> PathNode:
+        node = PathNode()
+        node.children = dict(self.children)
+        node.terminals = list(self.terminals)
+        node.count = self.count
+
+        return node
+
+    def nextKeys(self):
+        return self.children.keys()
+
+    def shortcuts(self) -> Iterator[Shortcut]:
+        """
+        Every shortcut that can still be reached from this node, depth first
+        """
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield from node.terminals
+
+            # Reversed so the first added child comes out first
+            stack.extend(reversed(node.children.values()))
+
+    def single(self) -> Shortcut | None:
+        """
+        The only shortcut under this node, or None if there isn't exactly one
+        """
+
+        if self.count != 1:
+            return None
+
+        node = self
+        while not node.terminals:
+            node = next(iter(node.children.values()))
+
+        return node.terminals[0]
+
+    def __repr__(self):
+        return f"PathNode(keys={list(self.children.keys())}, count={self.count})"
+
+
+class PathIndex:
+    root: PathNode
+    deadEnd: PathNode
+
+    def __init__(self):
+        self.root = PathNode()
+
+        # Shared by every step that walks off the index, never added to
+        self.deadEnd = PathNode()
+
+    def add(self, shortcut: Shortcut):
+        node = self.root
+        node.count += 1
+
+        for key in shortcut.keys():
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = PathNode()
+
+            node = child
+            node.count += 1
+
+        node.terminals.append(shortcut)
+
+    def addAll(self, shortcuts: Iterable[Shortcut]):
+        """
+        Same as add for each, in one pass without the per call overhead
+        """
+
+        root = self.root
+
+        for shortcut in shortcuts:
+            node = root
+            node.count += 1
+
+            for key in shortcut.keys():
+                children = node.children
+                node = children.get(key)
+                if node is None:
+                    node = children[key] = PathNode()
+
+                node.count += 1
+
+            node.terminals.append(shortcut)
+
+    def copyWith(
+        self, removed: Iterable[Shortcut], added: Iterable[Shortcut]
+    ) -> tuple[PathIndex, list[PathNode]]:
+        """
+        A new index with the changes applied, along with the nodes of this one
+            the new one replaced. Costs the length of the changed paths,
+            not the size of the index
+
+        ex: index, replaced = old.copyWith([oldShortcut], [newShortcut])
+        """
+
+        index = PathIndex.__new__(PathIndex)
+        index.root = self.root.copy()
+        index.deadEnd = self.deadEnd
+
+        replaced = [self.root]
+        # Nodes that are already the new index's own, safe to change in place
+        owned = {index.root}
+
+        def own(parent: PathNode, key: str) -> PathNode | None:
+            child = parent.children.get(key)
+            if child is None or child in owned:
+                return child
+
+            replaced.append(child)
+            child = parent.children[key] = child.copy()
+            owned.add(child)
+
+            return child
+
+        for shortcut in removed:
+            node = index.root
+            node.count -= 1
+
+            for key in shortcut.keys():
+                parent, node = node, own(node, key)
+                node.count -= 1
+
+                # Nothing else down here, drop the whole branch
+                if node.count == 0:
+                    del parent.children[key]
+                    break
+            else:
+                node.terminals.remove(shortcut)
+
+        for shortcut in added:
+            node = index.root
+            node.count += 1
+
+            for key in shortcut.keys():
+                child = own(node, key)
+                if child is None:
+                    child = node.children[key] = PathNode()
+                    owned.add(child)
+
+                node = child
+                node.count += 1
+
+            node.terminals.append(shortcut)
+
+        return index, replaced
+
+    def step(self, node: PathNode, key: str) -> PathNode:
+        child = node.children.get(key)
+
+        # Walked off the index, nothing is valid from here
+        if child is None:
+            logger.debug("No path for key: %r", key)
+            return self.deadEnd
+
+        return child
+
+    def __len__(self):
+        return self.root.count
+
+
+logger = logging.getLogger("PathIndex")
@@ -1,21 +1,72 @@
 import logging
 
-from typing import Callable
+from threading import Lock
+from typing import Awaitable, Callable, Iterator
 
 logger = logging.getLogger("Shortcut")
 
 
+# storage
+#   - tens of thousands of generated shortcuts add up, so no __dict__ per shortcut
+#   - the path is a tuple of key ids, the key strings live once in keyTable
+#   - the default label is only built when somebody asks for it
+
+
+class KeyTable:
+    """
+    Every key string any shortcut has used, each stored once and given a small id
+
+    ex: keyTable.intern("ctrl+a")  # same id every time
+        keyTable.key(id)  # back to "ctrl+a"
+    """
+
+    ids: dict[str, int]
+    keys: list[str]
+
+    def __init__(self):
+        self.ids = dict()
+        self.keys = list()
+        self.lock = Lock()
+
+    def intern(self, key: str) -> int:
+        id = self.ids.get(key)
+        if id is not None:
+            return id
+
+        # Two threads adding the same new key must end up with one id
+        with self.lock:
+            id = self.ids.get(key)
+            if id is None:
+                id = self.ids[key] = len(self.keys)
+                self.keys.append(key)
+
+        return id
+
+    def key(self, id: int) -> str:
+        return self.keys[id]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+keyTable = KeyTable()
+
+
 class Shortcut:
-    label: str
-    path: list[str]
-    runnable: Callable[[], None]
+    __slots__ = ("keyIds", "runnable", "onBeforeRun", "lastCheckedStep", "customLabel")
+
+    keyIds: tuple[int, ...]
+    # async def works too, see ShortcutManager.run
+    runnable: Callable[[], None | Awaitable[None]]
     onBeforeRun: Callable[[int], None]
     lastCheckedStep: int
+    # None until somebody asks for the label, see label
+    customLabel: str | None
 
     def __init__(
         self,
         path: list[str],
-        runnable: Callable[[], None],
+        runnable: Callable[[], None | Awaitable[None]],
         onBeforeRun: Callable[[int], None] = None,
         label: str = None,
     ):
@@ -25,18 +76,57 @@ class Shortcut:
 
         self.lastCheckedStep = 1
 
-        self.label = label
-        if not self.label:
-            self.label = f"{" ->".join(path[0:min(len(path), 3)])}"
+        self.customLabel = label or None
+
+    @property
+    def path(self) -> list[str]:
+        keys = keyTable.keys
+        return [keys[id] for id in self.keyIds]
+
+    @path.setter
+    def path(self, path: list[str]):
+        try:
+            # Nearly every key is already in the table, no Python call per key then
+            self.keyIds = tuple(map(keyTable.ids.__getitem__, path))
+        except KeyError:
+            self.keyIds = tuple(map(keyTable.intern, path))
+
+    def keys(self) -> Iterator[str]:
+        """
+        The path one key at a time, without building a list like path does
+        """
+
+        return map(keyTable.keys.__getitem__, self.keyIds)
+
+    @property
+    def depth(self):
+        """
+        Keys in the path, without building the path
+        """
+
+        return len(self.keyIds)
+
+    @property
+    def label(self) -> str:
+        if self.customLabel is None:
+            self.customLabel = f"{" ->".join(self.path[0:3])}"
+
+        return self.customLabel
+
+    @label.setter
+    def label(self, label: str):
+        self.customLabel = label or None
 
     def run(self):
-        logger.debug(
-            f"Running Macro: '{self.label}' after '{self.lastCheckedStep}' steps"
-        )
+        # label builds the default one, don't pay for that with debug off
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Running Macro: '%s' after '%d' steps", self.label, self.lastCheckedStep
+            )
         if self.onBeforeRun:
             self.onBeforeRun(self.lastCheckedStep)
 
-        self.runnable()
+        return self.runnable()
 
     def reset(self):
         self.lastCheckedStep = 1
@@ -48,21 +138,21 @@ class Shortcut:
         otherSteps = "".join(steps)
         selfSteps = "".join(self.path[0 : len(steps)])
 
-        logger.debug(f"Other step: {otherSteps}")
-        logger.debug(f"This step: {selfSteps}")
+        logger.debug("Other step: %s", otherSteps)
+        logger.debug("This step: %s", selfSteps)
 
         return otherSteps == selfSteps
 
     def getKeyForStep(self, steps: list[str]):
         self.lastCheckedStep = len(steps) + 1
 
-        if len(steps) > len(self.path):
+        if len(steps) > self.depth:
             return None
 
-        if len(steps) == len(self.path):
-            return self.path[len(steps) - 1]
+        if len(steps) == self.depth:
+            return keyTable.key(self.keyIds[len(steps) - 1])
 
-        return self.path[len(steps)]
+        return keyTable.key(self.keyIds[len(steps)])
 
     def __repr__(self):
         return f"Shortcut(path='{" ->".join(self.path)}', label='{self.label}')"
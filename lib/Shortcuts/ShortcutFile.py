@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tomllib
+
+from typing import Any, Callable
+
+from lib.Shortcuts.PathIndex import PathIndex
+from lib.Shortcuts.Shortcut import Shortcut
+
+
+# shortcut file
+#   - paths mapped to action names, TOML or JSON going by the extension
+#
+#       [shortcuts]
+#       "g g" = "top"
+#       "shift+g shift+g" = "bottom"
+#       "b v w" = { action = "selectWord", label = "Select word" }
+#       "p 5" = { action = "pressKeyNTimes", args = ["down", 5] }
+#
+#       # Keys with a space in their name ("page up", "left ctrl") need the list form
+#       [[shortcut]]
+#       path = ["page up", "g"]
+#       action = "top"
+#
+#   - keys in a [shortcuts] path are split on whitespace, actions are looked up by name
+#   - a TOML file's parsed entries get cached as JSON next to it
+#       - tomllib is a few times slower than json, that's all the cache saves.
+#         Shortcuts and the index are built on every load either way
+#       - a JSON file is already as quick to read as its cache would be, so it has none
+#       - keyed by the sha256 of the file, any edit and it's parsed again
+#       - plain data, reading it can't run anything. Whoever can write it can only
+#         point paths at the actions you passed in, same as editing the file
+#   - update diffs a changed file against what's loaded, unchanged entries keep their Shortcut
+
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache"
+
+type T_Path = tuple[str, ...]
+# action name, args, label
+type T_Entry = tuple[str, tuple[Any, ...], str | None]
+
+
+class ActionTable:
+    """
+    Action name -> callable, shared by every ActionRef from one file
+    """
+
+    actions: dict[str, Callable[..., Any]]
+
+    def __init__(self, actions: dict[str, Callable[..., Any]] = None):
+        self.actions = dict(actions or {})
+
+
+class ActionRef:
+    """
+    A Shortcut runnable that calls a named action, diffable unlike a lambda
+
+    ex: Shortcut(["g", "g"], ActionRef("top", (), table))
+    """
+
+    __slots__ = ("name", "args", "table")
+
+    name: str
+    args: tuple[Any, ...]
+    table: ActionTable
+
+    def __init__(self, name: str, args: tuple[Any, ...], table: ActionTable):
+        self.name = name
+        self.args = args
+        self.table = table
+
+    def __call__(self):
+        return self.table.actions[self.name](*self.args)
+
+    def __repr__(self):
+        return f"ActionRef(name='{self.name}', args={self.args})"
+
+
+class ShortcutFile:
+    """
+    Everything built from one shortcut file, see ShortcutManager.load
+
+    ex: compiled = ShortcutFile.read("shortcuts.toml", {"top": Navigation.top})
+        compiled.index.root.count
+    """
+
+    path: str
+    digest: str
+    entries: dict[T_Path, T_Entry]
+    shortcuts: dict[T_Path, Shortcut]
+    index: PathIndex | None
+    table: ActionTable
+    fromCache: bool
+
+    def __init__(
+        self,
+        path: str,
+        digest: str,
+        entries: dict[T_Path, T_Entry],
+        shortcuts: dict[T_Path, Shortcut],
+        index: PathIndex | None,
+        table: ActionTable,
+    ):
+        self.path = path
+        self.digest = digest
+        self.entries = entries
+        self.shortcuts = shortcuts
+        self.index = index
+        self.table = table
+        self.fromCache = False
+
+    @staticmethod
+    def read(
+        path: str,
+        actions: dict[str, Callable[..., Any]],
+        cachePath: str | None = None,
+        useCache: bool = True,
+    ) -> ShortcutFile:
+        """
+        Takes a TOML file's entries from the cache when it matches the file,
+            otherwise parses and writes a fresh cache. JSON files are just parsed
+
+        Raises KeyError if the file names an action that isn't in actions
+        """
+
+        with open(path, "rb") as file:
+            source = file.read()
+
+        digest = hashlib.sha256(source).hexdigest()
+        cachePath = cachePath or path + CACHE_SUFFIX
+        useCache = useCache and isToml(path)
+
+        entries = ShortcutFile.__readCache(cachePath, digest) if useCache else None
+        fromCache = entries is not None
+
+        if not fromCache:
+            entries = parseEntries(path, source)
+
+            if useCache:
+                ShortcutFile.__writeCache(cachePath, digest, entries)
+
+        compiled = ShortcutFile.build(path, digest, entries, ActionTable(actions))
+        compiled.fromCache = fromCache
+
+        missing = {name for name, _, _ in compiled.entries.values()} - actions.keys()
+        if missing:
+            raise KeyError(f"{path} uses unknown actions: {sorted(missing)}")
+
+        logger.debug(
+            "Loaded %d shortcuts from %s%s",
+            len(compiled.shortcuts),
+            path,
+            " (cached)" if compiled.fromCache else "",
+        )
+
+        return compiled
+
+    @staticmethod
+    def build(
+        path: str, digest: str, entries: dict[T_Path, T_Entry], table: ActionTable
+    ) -> ShortcutFile:
+        shortcuts = {
+            keys: Shortcut(list(keys), ActionRef(name, args, table), label=label)
+            for keys, (name, args, label) in entries.items()
+        }
+
+        index = PathIndex()
+        index.addAll(shortcuts.values())
+
+        return ShortcutFile(path, digest, entries, shortcuts, index, table)
+
+    def update(self) -> tuple[ShortcutFile, list[Shortcut], list[Shortcut]] | None:
+        """
+        Re-reads the file, None if it hasn't changed. Otherwise the updated
+            file plus the shortcuts that went away and the ones that are new,
+            a changed entry is one of each
+
+        The updated file has no index, that's for whoever owns the index to
+            patch, see PathIndex.copyWith
+        """
+
+        with open(self.path, "rb") as file:
+            source = file.read()
+
+        digest = hashlib.sha256(source).hexdigest()
+        if digest == self.digest:
+            return None
+
+        entries = parseEntries(self.path, source)
+
+        missing = {name for name, _, _ in entries.values()} - self.table.actions.keys()
+        if missing:
+            raise KeyError(f"{self.path} uses unknown actions: {sorted(missing)}")
+
+        previous = self.entries
+        removedKeys = [keys for keys, entry in previous.items() if entries.get(keys) != entry]
+        removed = [self.shortcuts[keys] for keys in removedKeys]
+
+        shortcuts = dict(self.shortcuts)
+        for keys in removedKeys:
+            del shortcuts[keys]
+
+        added = list()
+        for keys, (name, args, label) in entries.items():
+            if previous.get(keys) != entries[keys]:
+                shortcut = shortcuts[keys] = Shortcut(
+                    list(keys), ActionRef(name, args, self.table), label=label
+                )
+                added.append(shortcut)
+
+        updated = ShortcutFile(self.path, digest, entries, shortcuts, None, self.table)
+        return updated, removed, added
+
+    @staticmethod
+    def __readCache(cachePath: str, digest: str) -> dict[T_Path, T_Entry] | None:
+        try:
+            with open(cachePath, "rb") as file:
+                cached = json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Ignoring unreadable shortcut cache %s", cachePath, exc_info=True)
+            return None
+
+        if cached.get("version") != CACHE_VERSION or cached.get("digest") != digest:
+            return None
+
+        try:
+            return {
+                tuple(keys): (name, tuple(args), label)
+                for keys, name, args, label in cached["entries"]
+            }
+        except Exception:
+            logger.warning("Ignoring malformed shortcut cache %s", cachePath, exc_info=True)
+            return None
+
+    @staticmethod
+    def __writeCache(cachePath: str, digest: str, entries: dict[T_Path, T_Entry]):
+        # Written aside and renamed so a crash never leaves half a cache
+        partialPath = f"{cachePath}.{os.getpid()}.tmp"
+
+        try:
+            cached = {
+                "version": CACHE_VERSION,
+                "digest": digest,
+                "entries": [
+                    [keys, name, args, label] for keys, (name, args, label) in entries.items()
+                ],
+            }
+
+            with open(partialPath, "w", encoding="utf-8") as file:
+                # Compact, it's never read by a person
+                json.dump(cached, file, separators=(",", ":"))
+
+            os.replace(partialPath, cachePath)
+        except Exception:
+            # TOML dates in args and the like, the file still loads, just uncached
+            logger.warning("Couldn't write shortcut cache %s", cachePath, exc_info=True)
+
+            try:
+                os.remove(partialPath)
+            except OSError:
+                pass
+
+    def __repr__(self):
+        return f"ShortcutFile(path='{self.path}', shortcuts={len(self.shortcuts)})"
+
+
+def isToml(path: str) -> bool:
+    return path.lower().endswith(".toml")
+
+
+def parseEntries(path: str, source: bytes) -> dict[T_Path, T_Entry]:
+    """
+    path only picks the format, source is the file's bytes
+
+    ex: parseEntries("a.json", b'{"shortcuts": {"g g": "top"}}')
+        # {("g", "g"): ("top", (), None)}
+        parseEntries("a.json", b'{"shortcut": [{"path": ["page up"], "action": "top"}]}')
+        # {("page up",): ("top", (), None)}
+    """
+
+    if isToml(path):
+        document = tomllib.loads(source.decode("utf-8"))
+    else:
+        document = json.loads(source)
+
+    declared = document.get("shortcuts", {})
+    listed = document.get("shortcut", [])
+
+    if not isinstance(declared, dict) or not isinstance(listed, list):
+        raise ValueError(
+            f"{path} needs a 'shortcuts' table of path = action and / or a 'shortcut' list"
+        )
+
+    if not declared and not listed:
+        raise ValueError(f"{path} has no 'shortcuts' table or 'shortcut' list")
+
+    entries: dict[T_Path, T_Entry] = dict()
+
+    def addEntry(keys: T_Path, spec: Any, where: str):
+        if not keys or not all(isinstance(key, str) and key.strip() for key in keys):
+            raise ValueError(f"{path}: {where} needs a path of key names")
+
+        if isinstance(spec, str):
+            entry = (spec, (), None)
+        elif isinstance(spec, dict) and isinstance(spec.get("action"), str):
+            entry = (spec["action"], tuple(spec.get("args", ())), spec.get("label"))
+        else:
+            raise ValueError(f"{path}: {where} needs an action name, got {spec!r}")
+
+        if keys in entries:
+            logger.warning("%s: %s is declared twice, the last one wins", path, where)
+
+        entries[keys] = entry
+
+    for rawPath, spec in declared.items():
+        addEntry(tuple(rawPath.split()), spec, f"'{rawPath}'")
+
+    for index, spec in enumerate(listed):
+        keys = spec.get("path") if isinstance(spec, dict) else None
+        if isinstance(keys, str):
+            keys = [keys]
+
+        addEntry(tuple(keys or ()), spec, f"shortcut #{index + 1}")
+
+    return entries
+
+
+logger = logging.getLogger("ShortcutFile")
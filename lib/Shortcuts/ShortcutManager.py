@@ -1,16 +1,31 @@
 from __future__ import annotations
 
-from time import sleep
-
-import keyboard
-import threading
+import asyncio
+import inspect
 import logging
-
+import os
+
+from itertools import islice
+from threading import Lock
+from lib.Shortcuts.InputBackend import InputBackend, KeyboardBackend, KeyEvent
+from lib.Shortcuts.Metrics import Metrics
+from lib.Shortcuts.Trace import KeyTrace
+from lib.Shortcuts.PathIndex import PathIndex, PathNode
 from lib.Shortcuts.Shortcut import Shortcut
-from typing import Any, Callable, Dict, Literal
+from lib.Shortcuts.ShortcutFile import ShortcutFile
+from lib.Shortcuts.WorkerPool import T_Backpressure, WorkerPool
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Literal
+
+from lib.WindowManager import (
+    ScheduledTask,
+    Window,
+    getForegroundWindowAsObject,
+    scheduler,
+)
 
-from lib.Window.HotkeyWindow import T_WindowMessage, WindowMessage, WindowThreadWrapper
-from lib.WindowManager import Window, getForegroundWindowAsObject
+# Tk is only imported when the manager isn't headless
+if TYPE_CHECKING:
+    from lib.Window.HotkeyWindow import WindowThreadWrapper
 
 
 # shortcut
@@ -37,9 +52,9 @@ class KeyCode:
     code: str
     parsedHotkey: tuple[tuple[tuple[int, ...], ...], ...]
 
-    def __init__(self, code: str):
+    def __init__(self, code: str, backend: InputBackend):
         self.code = code
-        self.parsedHotkey = keyboard.parse_hotkey(code)
+        self.parsedHotkey = backend.parseHotkey(code)
 
     def __repr__(self):
         return f"KeyCode(code={self.code}, parsed={self.parsedHotkey})"
@@ -64,9 +79,78 @@ class ManagerOptions:
     addDummyShortcut: bool
     requireFullPath: bool
 
-    def __init__(self, addDummyShortcut: bool = True, requireFullPath: bool = False):
+    # "hotkey" registers one keyboard.add_hotkey per candidate key
+    # "hook" installs a single keyboard.hook and routes every event itself
+    hookMode: Literal["hotkey", "hook"]
+
+    # No Tk window and no target window tracking, for tests and benchmarks
+    headless: bool
+
+    # A chord with no key for this many seconds gets dropped, None waits forever
+    chordTimeout: float | None
+
+    # Shortcuts and GUI updates run on a small pool instead of a thread each
+    #   - a long running shortcut (subprocess.run, waiting on a window) holds a
+    #     worker the whole time, with a lot of those raise workerCount
+    #   - a full queue drops by default, "spawn" gives the task its own thread
+    #     instead, up to workerMaxSpawned at once
+    #   - never pick "block" or "caller", they stall the keyboard callback
+    workerCount: int
+    workerQueueSize: int
+    workerBackpressure: T_Backpressure
+    workerMaxSpawned: int
+
+    # How long to wait for the target window to come back before running anyway
+    activationTimeout: float
+    activationPollInterval: float
+
+    # Per stage timings in manager.metrics, costs nothing when off
+    metrics: bool
+    metricsCapacity: int
+
+    # (timestamp, step, candidates) per key in manager.trace, no strings
+    trace: bool
+    traceCapacity: int
+
+    def __init__(
+        self,
+        addDummyShortcut: bool = True,
+        requireFullPath: bool = False,
+        hookMode: Literal["hotkey", "hook"] = "hotkey",
+        headless: bool = False,
+        chordTimeout: float = None,
+        workerCount: int = 2,
+        workerQueueSize: int = 64,
+        workerBackpressure: T_Backpressure = "drop",
+        workerMaxSpawned: int = 8,
+        activationTimeout: float = 0.2,
+        activationPollInterval: float = 0.01,
+        metrics: bool = False,
+        metricsCapacity: int = 4096,
+        trace: bool = False,
+        traceCapacity: int = 4096,
+    ):
         self.addDummyShortcut = addDummyShortcut
         self.requireFullPath = requireFullPath
+        self.hookMode = hookMode
+        self.headless = headless
+        self.chordTimeout = chordTimeout
+        self.workerCount = workerCount
+        self.workerQueueSize = workerQueueSize
+        self.workerBackpressure = workerBackpressure
+        self.workerMaxSpawned = workerMaxSpawned
+        self.activationTimeout = activationTimeout
+        self.activationPollInterval = activationPollInterval
+        self.metrics = metrics
+        self.metricsCapacity = metricsCapacity
+        self.trace = trace
+        self.traceCapacity = traceCapacity
+
+
+# (modifier scan code groups, every modifier scan code, key, onPress)
+type T_HookEntry = tuple[
+    tuple[tuple[int, ...], ...], frozenset[int], KeyCode, Callable[[KeyCode], None]
+]
 
 
 class ShortcutManager:
@@ -78,11 +162,43 @@ class ShortcutManager:
     onExit: Callable[[], None]
     options: ManagerOptions
     pathAccumulator: list[str]
-    targetWindow: Window
+    targetWindow: Window | None
+    backend: InputBackend
 
+    # Only what addShortcut added, the file's shortcuts stay in shortcutFile
     shortcuts: list[Shortcut]
-
-    windowManager: WindowThreadWrapper
+    pathIndex: PathIndex
+    currentNode: PathNode
+    # What load / watch last read, reload diffs against it
+    shortcutFile: ShortcutFile | None
+    watchTask: ScheduledTask | None
+    # Only with options.chordTimeout, bumped on every key so a late timer knows it's stale
+    chordTimer: ScheduledTask | None
+    chordGeneration: int
+
+    # key -> (onPress, handle from backend.addHotkey)
+    hookedKeys: Dict[str, tuple[Callable[[KeyCode], None], Any]]
+
+    # Every key parsed once, when a shortcut using it is added
+    chords: Dict[str, KeyCode]
+    # node -> keys to hook while sitting on it, None is idle (just the command key)
+    nodeHooks: Dict[PathNode | None, Dict[str, Callable[[KeyCode], None]]]
+
+    # Only used when options.hookMode == "hook"
+    keyHook: Any
+    hookTable: Dict[int, list[T_HookEntry]]
+    hookTables: Dict[PathNode | None, Dict[int, list[T_HookEntry]]]
+    heldModifiers: set[int]
+    suppressedScanCodes: set[int]
+
+    windowManager: WindowThreadWrapper | None
+    workers: WorkerPool
+    metrics: Metrics | None
+    trace: KeyTrace | None
+
+    # Set while run() is awaited, coroutine shortcuts are scheduled on it
+    loop: asyncio.AbstractEventLoop | None
+    stopped: asyncio.Event | None
 
     def __init__(
         self,
@@ -91,18 +207,65 @@ class ShortcutManager:
         onBreakout: Callable[[], None] = lambda: (),
         onCommandRun: Callable[[], None] = lambda: (),
         options: ManagerOptions = None,
+        backend: InputBackend = None,
     ):
-        self.windowManager = WindowThreadWrapper()
+        self.options = options or ManagerOptions()
+        self.backend = backend or KeyboardBackend()
+        self.metrics = (
+            Metrics(self.options.metricsCapacity) if self.options.metrics else None
+        )
+        self.trace = (
+            KeyTrace(self.options.traceCapacity) if self.options.trace else None
+        )
+        self.workers = WorkerPool(
+            workers=self.options.workerCount,
+            queueSize=self.options.workerQueueSize,
+            backpressure=self.options.workerBackpressure,
+            maxSpawned=self.options.workerMaxSpawned,
+        )
+
+        self.windowManager = None
+        self.targetWindow = None
+        self.loop = None
+        self.stopped = None
+        if not self.options.headless:
+            from lib.Window.HotkeyWindow import WindowThreadWrapper
+
+            self.windowManager = WindowThreadWrapper()
+
         self.cmdKey = cmdHotkey
         self.breakoutHotkey = breakoutHotkey or "esc"
         self.onBreakout = onBreakout
         self.onExit = onCommandRun
 
         self.shortcuts = list()
+        self.pathIndex = PathIndex()
+        self.currentNode = self.pathIndex.root
         self.pathAccumulator = list()
-        self.options = options or ManagerOptions()
+
+        self.shortcutFile = None
+        self.watchTask = None
+        self.reloadLock = Lock()
+
+        self.chordTimer = None
+        self.chordGeneration = 0
+
+        self.keyHook = None
+        self.hookTable = dict()
+        self.hookTables = dict()
+        self.heldModifiers = set()
+        self.suppressedScanCodes = set()
+
+        self.chords = dict()
+        self.nodeHooks = dict()
+        for node in (None, self.pathIndex.root, self.pathIndex.deadEnd):
+            self.__compileNode(node)
 
         self.__unhookAllKeys()
+
+        if self.options.hookMode == "hook":
+            self.keyHook = self.backend.hook(self.__onKeyEvent, suppress=True)
+
         self.__hookCmdKey()
 
         if self.options.addDummyShortcut:
@@ -116,52 +279,287 @@ class ShortcutManager:
                 )
             )
 
-    def __dispatch(self, target: Callable[[], None], name: str = "Dispatched Thread"):
-        thread = threading.Thread(target=target, name=name)
-        thread.start()
-        return thread
+    def __dispatch(self, target: Callable[[], None], name: str = "Dispatched Task"):
+        submitted = self.workers.submit(target, name)
+
+        if not submitted and self.metrics is not None:
+            self.metrics.count("dispatchDropped")
+
+        return submitted
 
     def __unhookAllKeys(self):
+        self.hookedKeys = dict()
+
         try:
-            keyboard.remove_all_hotkeys()
+            self.backend.removeAllHotkeys()
         except:
             logger.debug("No hotkeys to remove...")
 
+    def __unhookKey(self, key: str):
+        _, handle = self.hookedKeys.pop(key)
+
+        try:
+            self.backend.removeHotkey(handle)
+        except:
+            logger.debug("Hotkey: %r was already removed...", key)
+
     def __hookKey[T = None](
         self,
         key: str,
         onPress: Callable[[KeyCode, T], None],
         args: Option[T] = Option(value=()),
     ):
-        logger.debug(f"Hotkey: {repr(key)} added")
+        logger.debug("Hotkey: %r added", key)
+
+        # Compiled when the shortcut was added, nothing to parse here
+        keyCode = self.__chordFor(key)
+        pressArgs = Option.get(args)
+        metrics = self.metrics
+
+        # Decided once here, so with metrics off there isn't even a check per press
+        if metrics is None:
+
+            def onPressPreHook():
+                onPress(keyCode, *pressArgs)
+
+        else:
+
+            def onPressPreHook():
+                start = metrics.now()
+                onPress(keyCode, *pressArgs)
+                metrics.record("hook", start)
+
+        # The string, not parsedHotkey, keyboard re-parses a one-step parsed tuple
+        #   into a flat key list and "shift+g" would fire on shift alone
+        return self.backend.addHotkey(keyCode.code, onPressPreHook)
+
+    def __chordFor(self, key: str) -> KeyCode:
+        keyCode = self.chords.get(key)
+
+        if keyCode is None:
+            keyCode = self.chords[key] = KeyCode(key, self.backend)
 
-        def onPressPreHook():
-            logger.debug(f"Key: {KeyCode(key)} pressed")
-            onPress(KeyCode(key), *Option.get(args))
+        return keyCode
 
-        keyboard.add_hotkey(key, onPressPreHook)
+    def __parseChords(self, shortcuts: Iterable[Shortcut]):
+        # Parsed up front, the first chord through a node shouldn't pay for it
+        #   on the keyboard thread. Only the per node hook dicts wait for a visit
+        for shortcut in shortcuts:
+            for key in shortcut.keys():
+                self.__chordFor(key)
+
+    def __compileNode(self, node: PathNode | None):
+        """
+        Works out the keys to hook on node, and their hook table in hook mode,
+            the first time the node is visited. Every visit after is just a lookup
+        """
+
+        if node is None:
+            wanted = {self.cmdKey: self.__onCommandKeyPressed}
+        else:
+            wanted = {key: self.__onPathKeyPressed for key in node.nextKeys()}
+            wanted[self.breakoutHotkey] = self.__onBreakoutKeyPressed
+
+        for key in wanted:
+            self.__chordFor(key)
+
+        self.nodeHooks[node] = wanted
+
+        if self.options.hookMode == "hook":
+            self.hookTables[node] = self.__compileHookTable(wanted)
+
+        return wanted
+
+    def __syncHooks(self, node: PathNode | None):
+        metrics = self.metrics
+
+        if metrics is None:
+            self.__applyHooks(node)
+            return
+
+        start = metrics.now()
+        self.__applyHooks(node)
+        metrics.record("rehook", start)
+
+    def __applyHooks(self, node: PathNode | None):
+        """
+        Only touches the difference between what is hooked and what we want,
+            keys shared between steps stay registered the whole time
+
+        In hook mode nothing is registered, we just swap the table
+            the single hook routes through
+        """
+
+        wanted = self.nodeHooks.get(node)
+        if wanted is None:
+            wanted = self.__compileNode(node)
+
+        if self.options.hookMode == "hook":
+            # A reload can swap the tables out between compiling and here
+            hookTable = self.hookTables.get(node)
+            if hookTable is None:
+                hookTable = self.hookTables[node] = self.__compileHookTable(wanted)
+
+            self.hookTable = hookTable
+            return
+
+        for key, (onPress, _) in list(self.hookedKeys.items()):
+            if wanted.get(key) != onPress:
+                self.__unhookKey(key)
+
+        for key, onPress in wanted.items():
+            if key not in self.hookedKeys:
+                self.hookedKeys[key] = (onPress, self.__hookKey(key, onPress))
+
+    def __compileHookTable(
+        self, wanted: Dict[str, Callable[[KeyCode], None]]
+    ) -> Dict[int, list[T_HookEntry]]:
+        """
+        Flattens the wanted keys into trigger scan code -> entries, so an event
+            is one dict lookup
+        """
+
+        table: Dict[int, list[T_HookEntry]] = dict()
+
+        for key, onPress in wanted.items():
+            keyCode = self.__chordFor(key)
+
+            if len(keyCode.parsedHotkey) != 1:
+                logger.warning("Hook mode can't route multi-step hotkey: %r", key)
+                continue
+
+            # Last group is the key itself, everything before it is a modifier
+            *modifiers, trigger = keyCode.parsedHotkey[0]
+            modifiers = tuple(modifiers)
+            modifierCodes = frozenset(code for group in modifiers for code in group)
+
+            for scanCode in trigger:
+                table.setdefault(scanCode, list()).append(
+                    (modifiers, modifierCodes, keyCode, onPress)
+                )
+
+        # Most modifiers first so "shift+g" wins over "g" while shift is held
+        for entries in table.values():
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+        return table
+
+    def __onKeyEvent(self, event: KeyEvent) -> bool:
+        """
+        The single hook in hook mode, returning False suppresses the event
+        """
+
+        scanCode = event.scan_code
+
+        if event.event_type == self.backend.KEY_UP:
+            self.heldModifiers.discard(scanCode)
+
+            # Don't leak the release of a key we swallowed the press of
+            if scanCode in self.suppressedScanCodes:
+                self.suppressedScanCodes.discard(scanCode)
+                return False
+
+            return True
+
+        if self.backend.isModifier(scanCode):
+            self.heldModifiers.add(scanCode)
+
+        entries = self.hookTable.get(scanCode)
+        if not entries:
+            return True
+
+        for modifiers, modifierCodes, keyCode, onPress in entries:
+            if not self.__chordHeld(modifiers, modifierCodes, scanCode):
+                continue
+
+            if self.metrics is None:
+                onPress(keyCode)
+            else:
+                start = self.metrics.now()
+                onPress(keyCode)
+                self.metrics.record("hook", start)
+
+            # The command key passes through like it does with add_hotkey
+            if onPress == self.__onCommandKeyPressed:
+                return True
+
+            self.suppressedScanCodes.add(scanCode)
+            return False
+
+        return True
+
+    def __chordHeld(
+        self,
+        modifiers: tuple[tuple[int, ...], ...],
+        modifierCodes: frozenset[int],
+        scanCode: int,
+    ) -> bool:
+        # Plain loops, no generators to allocate per event
+        for group in modifiers:
+            if self.heldModifiers.isdisjoint(group):
+                return False
+
+        # Any other modifier held means it's a different chord
+        for code in self.heldModifiers:
+            if code != scanCode and code not in modifierCodes:
+                return False
+
+        return True
 
     def __hookCmdKey(self):
-        self.__hookKey(self.cmdKey, self.__onCommandKeyPressed)
+        self.__syncHooks(None)
+
+    def __restartChordTimer(self):
+        timeout = self.options.chordTimeout
+        if timeout is None:
+            return
+
+        if self.chordTimer is not None:
+            self.chordTimer.cancel()
+
+        self.chordGeneration += 1
+        generation = self.chordGeneration
+
+        def onTimeout():
+            # A key got in first
+            if generation != self.chordGeneration:
+                return
+
+            logger.debug("Chord timed out")
+            if self.metrics is not None:
+                self.metrics.count("chordTimeouts")
+
+            self.__cleanup()
+
+        self.chordTimer = scheduler.callLater(timeout, onTimeout)
+
+    def __stopChordTimer(self):
+        self.chordGeneration += 1
+
+        if self.chordTimer is not None:
+            self.chordTimer.cancel()
+            self.chordTimer = None
 
     def __cleanup(self):
+        self.__stopChordTimer()
         self.pathAccumulator = list()
-        self.__unhookAllKeys()
+        self.currentNode = self.pathIndex.root
         self.__hookCmdKey()
 
-        [shortcut.reset() for shortcut in self.shortcuts]
+        if self.windowManager:
+            metrics = self.metrics
+            if metrics is not None:
+                start = metrics.now()
 
-        # Clear GUI Text
-        def clearText():
-            self.windowManager.windowRef.updateEntry("")
-            self.windowManager.windowRef.updateHelpText("")
+            # Clear GUI Text
+            self.windowManager.setEntry("")
+            self.windowManager.setHelpText("")
 
-        self.__dispatch(target=clearText, name="Clear-Text")
+            # Minimize GUI
+            self.windowManager.hide()
 
-        # Minimize GUI
-        self.__dispatch(
-            target=self.windowManager.windowRef.root.iconify, name="Iconify"
-        )
+            if metrics is not None:
+                metrics.record("guiDispatch", start)
 
         if self.onExit:
             self.onExit()
@@ -169,101 +567,411 @@ class ShortcutManager:
         return
 
     def __hookCurrentPaths(self):
-        self.__unhookAllKeys()
-
-        validPaths: list[Shortcut] = []
+        node = self.currentNode
 
-        for path in self.shortcuts:
-            if len(self.pathAccumulator) != 0 and not path.matchesStep(
-                self.pathAccumulator
-            ):
-                continue
+        if self.trace is not None:
+            self.trace.record(len(self.pathAccumulator), node.count)
 
-            validPaths.append(path)
+        foundShortcut = node.single()
 
-        if len(validPaths) == 1:
+        if foundShortcut:
             #
             # This is where we've found the shortcut
             #
 
-            firstShortcut = validPaths[0]
-            fullPathCheck = len(self.pathAccumulator) >= len(firstShortcut.path)
+            fullPathCheck = len(self.pathAccumulator) >= foundShortcut.depth
 
             if self.options.requireFullPath and not fullPathCheck:
                 # Just let it keep going if strict
-                logger.debug(f"Strict Mode Enabled!")
+                logger.debug("Strict Mode Enabled!")
                 logger.debug(
-                    f"{len(self.pathAccumulator)} out of {len(firstShortcut.path) - len(self.pathAccumulator)} keys remaining"
+                    "%d out of %d keys remaining",
+                    len(self.pathAccumulator),
+                    foundShortcut.depth - len(self.pathAccumulator),
                 )
-                pass
             else:
                 # Otherwise we run that shit yo
-                self.__runFoundShortcut(firstShortcut)
+                self.__runFoundShortcut(foundShortcut)
                 self.__cleanup()
                 return
 
-        def onHookPressLogic(keyCode: KeyCode, *args: list[Any]):
-            logger.debug(f"Key pressed: {keyCode.code}")
-            self.pathAccumulator.append(keyCode.code)
-            self.__hookCurrentPaths()
-
-            # GUI Stuff
-            def updateGUI():
-                self.windowManager.windowRef.updateEntry("+".join(self.pathAccumulator))
-                self.windowManager.windowRef.updateHelpText(
-                    "Valid Paths:\n"
-                    + "\n".join(["+".join(shortcut.path) for shortcut in validPaths])
-                )
+        # Listing every continuation isn't free, only when someone's reading
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("All valid continuations - %s", list(node.nextKeys()))
 
-            self.__dispatch(updateGUI, "GUI-Update")
+        self.__syncHooks(node)
+        self.__restartChordTimer()
 
-        # Wait we fucked up key
-        def onBreakoutHotkeyPressed(keyCode: KeyCode, *args: list[Any]):
-            logger.debug("Breakout!")
-            self.onBreakout()
-            self.__cleanup()
+    def __onPathKeyPressed(self, keyCode: KeyCode, *args: list[Any]):
+        logger.debug("Key pressed: %s", keyCode.code)
+        metrics = self.metrics
+
+        if metrics is not None:
+            metrics.count("pathKeys")
+            start = metrics.now()
+
+        self.pathAccumulator.append(keyCode.code)
+        self.currentNode = self.pathIndex.step(self.currentNode, keyCode.code)
+
+        if metrics is not None:
+            metrics.record("pathFilter", start)
+
+        self.__hookCurrentPaths()
 
-        logger.debug(f"All valid paths -")
+        # Shortcut already ran, nothing left to show
+        if not self.pathAccumulator or not self.windowManager:
+            return
 
-        for path in validPaths:
-            logger.debug(f"{repr(path)}")
+        if metrics is not None:
+            start = metrics.now()
 
-            self.__hookKey(path.getKeyForStep(self.pathAccumulator), onHookPressLogic)
+        # GUI Stuff, only the latest of a burst gets rendered
+        validNode = self.currentNode
 
-        self.__hookKey(self.breakoutHotkey, onBreakoutHotkeyPressed)
+        # Only the rows on screen are ever joined
+        def fetchPaths(offset: int, limit: int):
+            return [
+                "+".join(shortcut.path)
+                for shortcut in islice(validNode.shortcuts(), offset, offset + limit)
+            ]
+
+        self.windowManager.setEntry("+".join(self.pathAccumulator))
+        self.windowManager.setHelpCandidates("Valid Paths", validNode.count, fetchPaths)
+
+        if metrics is not None:
+            metrics.record("guiDispatch", start)
+
+    # Wait we fucked up key
+    def __onBreakoutKeyPressed(self, keyCode: KeyCode, *args: list[Any]):
+        logger.debug("Breakout!")
+
+        if self.metrics is not None:
+            self.metrics.count("breakouts")
+
+        self.onBreakout()
+        self.__cleanup()
 
     def __runFoundShortcut(self, shortcut: Shortcut):
         logger.debug("Running shortcut!")
 
-        # Re-activate targeted window
-        self.targetWindow.tryActivate()
+        # Steps it took to get here, handed to onBeforeRun
+        shortcut.lastCheckedStep = max(len(self.pathAccumulator), 1)
+
+        targetWindow = self.targetWindow
+
+        # Off the hook thread, the activation wait shouldn't hold up the keyboard
+        def activateAndRun():
+            if targetWindow:
+                self.__activateTargetWindow(targetWindow)
+
+            self.runShortcut(shortcut)
+
+        self.__dispatch(activateAndRun, "Run-Shortcut")
+
+    def __activateTargetWindow(self, targetWindow: Window):
+        metrics = self.metrics
 
-        # Cheeky little "what if the window isn't raised yet" check
-        sleep(0.2)
+        if metrics is None:
+            self.__raiseTargetWindow(targetWindow)
+            return
 
-        threading.Thread(target=lambda: self.runShortcut(shortcut)).start()
+        start = metrics.now()
+        self.__raiseTargetWindow(targetWindow)
+        metrics.record("activation", start)
+
+    def __raiseTargetWindow(self, targetWindow: Window):
+        # Still on top, nothing to do
+        if targetWindow.isForeground():
+            return
+
+        # Re-activate targeted window
+        targetWindow.tryActivate()
+
+        # Returns the moment it's raised instead of always sleeping
+        if not targetWindow.waitForeground(
+            self.options.activationTimeout, self.options.activationPollInterval
+        ):
+            logger.debug(
+                "Target window not raised after %ss, running anyway",
+                self.options.activationTimeout,
+            )
 
     def __onCommandKeyPressed(self, key: KeyCode):
         logger.debug("Command Key pressed")
+        metrics = self.metrics
 
-        # Get a reference to users current window
-        self.targetWindow: Window = getForegroundWindowAsObject()
+        if metrics is not None:
+            metrics.count("chords")
 
-        # Show GUI
-        self.windowManager.windowRef.root.deiconify()
+        if self.windowManager:
+            if metrics is not None:
+                start = metrics.now()
 
-        self.__unhookAllKeys()
+            # Get a reference to users current window
+            self.targetWindow = getForegroundWindowAsObject()
+
+            # Show GUI
+            self.windowManager.show()
+
+            if metrics is not None:
+                metrics.record("guiDispatch", start)
+
+        # The chord runs against the index as it is now, even if a reload lands mid chord
+        self.currentNode = self.pathIndex.root
         self.__hookCurrentPaths()
 
     def addShortcut(self, shortcut: Shortcut):
-        self.shortcuts.append(shortcut)
+        self.__parseChords((shortcut,))
+
+        # Edits the index in place, a reload copying it halfway through would
+        #   lose the shortcut or share half updated nodes
+        with self.reloadLock:
+            self.shortcuts.append(shortcut)
+            self.pathIndex.add(shortcut)
+
+            # Only the nodes along the new path got new children, forget what was
+            #   compiled for those and they compile again on their next visit, like load
+            node = self.pathIndex.root
+            self.__forgetNode(node)
+
+            for key in shortcut.keys():
+                node = self.pathIndex.step(node, key)
+                self.__forgetNode(node)
+
+    def __forgetNode(self, node: PathNode):
+        self.nodeHooks.pop(node, None)
+        self.hookTables.pop(node, None)
+
+    def load(
+        self,
+        path: str,
+        actions: Dict[str, Callable[..., Any]],
+        cachePath: str = None,
+        useCache: bool = True,
+    ) -> ShortcutFile:
+        """
+        Adds every shortcut in a TOML / JSON file, see ShortcutFile for the format.
+            Replaces whatever the last load brought in, addShortcut ones stay.
+            Restarts with an unchanged TOML file skip parsing it
+
+        ex: manager.load("shortcuts.toml", {"top": lambda: Navigation.to("top")})
+        """
+
+        loaded = ShortcutFile.read(path, actions, cachePath, useCache)
+        self.__parseChords(loaded.shortcuts.values())
+
+        # The file's index is already built, move the addShortcut ones onto it rather
+        #   than the other way round, usually that's just the dummy shortcut.
+        #   The previous file's never make it over, loading twice doesn't double up
+        index = loaded.index
+
+        with self.reloadLock:
+            index.addAll(self.shortcuts)
+            self.shortcutFile = loaded
+            self.__swapIndex(index)
+
+        return loaded
+
+    def watch(
+        self,
+        path: str,
+        actions: Dict[str, Callable[..., Any]],
+        interval: float = 1.0,
+        cachePath: str = None,
+    ) -> ScheduledTask:
+        """
+        load, then reload whenever the file changes. Chords already being typed
+            finish on the shortcuts they started with. Already loaded files aren't
+            read again
+
+        ex: manager.watch("shortcuts.toml", actions)
+        """
+
+        current = self.shortcutFile
+        if current is None or os.path.abspath(current.path) != os.path.abspath(path):
+            self.load(path, actions, cachePath)
+
+        if self.watchTask is not None:
+            self.watchTask.cancel()
+
+        lastSeen = self.__fileStamp(path)
+
+        def poll():
+            nonlocal lastSeen
+
+            stamp = self.__fileStamp(path)
+            if stamp is None or stamp == lastSeen:
+                return
+
+            # Parsing thousands of shortcuts is no job for the scheduler thread.
+            #   Dropped when the pool's full, the next poll tries again
+            if self.__dispatch(self.reload, "Reload-Shortcuts"):
+                lastSeen = stamp
+
+        self.watchTask = scheduler.every(interval, poll)
+        return self.watchTask
+
+    @staticmethod
+    def __fileStamp(path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Editors that save by replacing the file leave a gap
+            return None
+
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload(self) -> bool:
+        """
+        Picks up changes to the file load / watch read, False if there were none.
+            Only the changed paths are rebuilt, a broken file keeps the old shortcuts
+        """
+
+        with self.reloadLock:
+            current = self.shortcutFile
+            if current is None:
+                return False
+
+            try:
+                changes = current.update()
+            except Exception:
+                logger.exception("Keeping the old shortcuts, couldn't reload %s", current.path)
+                return False
+
+            if changes is None:
+                return False
+
+            updated, removed, added = changes
+            self.__parseChords(added)
+            index, replaced = self.pathIndex.copyWith(removed, added)
+            updated.index = index
+
+            self.shortcutFile = updated
+            self.__swapIndex(index, replaced)
+
+        if self.metrics is not None:
+            self.metrics.count("reloads")
+
+        logger.info(
+            "Reloaded %s, %d removed and %d added", current.path, len(removed), len(added)
+        )
+        return True
+
+    def __swapIndex(self, index: PathIndex, replaced: list[PathNode] = None):
+        """
+        replaced are the old nodes index doesn't share, without them every
+            compiled node goes
+        """
+
+        # Nodes the new index still shares keep their compiled hooks, the rest
+        #   compile on first visit
+        if replaced is None:
+            self.nodeHooks = dict()
+            self.hookTables = dict()
+        else:
+            for node in replaced:
+                self.__forgetNode(node)
+
+        self.__compileNode(None)
+        self.__compileNode(index.root)
+
+        # Whole swap is this one assignment, a chord already under way keeps
+        #   walking the nodes it started on
+        self.pathIndex = index
 
     def runShortcut(self, shortcut: Shortcut):
-        shortcut.run()
+        metrics = self.metrics
+
+        if metrics is None:
+            result = shortcut.run()
+        else:
+            metrics.count("shortcutsRun")
+            start = metrics.now()
+            result = shortcut.run()
+            metrics.record("runnable", start)
+
+        shortcut.reset()
+
+        # async def shortcuts
+        if inspect.isawaitable(result):
+            self.__runCoroutine(result, shortcut)
+
+    def __runCoroutine(self, coroutine, shortcut: Shortcut):
+        loop = self.loop
+
+        # Nobody's awaiting run(), give it a loop of its own on this worker
+        if loop is None or loop.is_closed():
+            asyncio.run(coroutine)
+            return
+
+        # Don't hold the worker, the coroutine lives on run()'s loop now
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+        def onDone(future):
+            if not future.cancelled() and future.exception() is not None:
+                logger.error("Shortcut %s failed", shortcut, exc_info=future.exception())
+
+        future.add_done_callback(onDone)
+
+    async def run(self, untilHotkey: str = None):
+        """
+        Keeps the manager going on the running asyncio loop until shutdown()
+            or untilHotkey. Shortcuts whose runnable is a coroutine function
+            run on this loop, so they can await waitForWindow and friends
+
+        ex: manager.addShortcut(Shortcut(["n", "o"], openNotepadAndType))
+            await manager.run()
+        """
+
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+
+        stopHandle = None
+        if untilHotkey:
+            stopHandle = self.backend.addHotkey(
+                untilHotkey,
+                lambda: self.loop.call_soon_threadsafe(self.stopped.set),
+            )
+
+        try:
+            await self.stopped.wait()
+        finally:
+            # shutdown() may have already taken every hotkey with it
+            if stopHandle is not None:
+                try:
+                    self.backend.removeHotkey(stopHandle)
+                except:
+                    logger.debug("Hotkey %s already removed", untilHotkey)
+
+            self.loop = None
+            self.stopped = None
+
+    def shutdown(self, wait: bool = True):
+        """
+        Unhooks everything and lets queued shortcuts finish
+        """
+
+        if self.watchTask is not None:
+            self.watchTask.cancel()
+            self.watchTask = None
+
+        self.__stopChordTimer()
+
+        if self.keyHook is not None:
+            self.backend.unhook(self.keyHook)
+            self.keyHook = None
+
+        self.__unhookAllKeys()
+        self.workers.shutdown(wait=wait)
+
+        # Let run() return
+        loop, stopped = self.loop, self.stopped
+        if loop is not None and stopped is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(stopped.set)
 
     @staticmethod
-    def wait(forCmdHotkey: str = None):
-        keyboard.wait(forCmdHotkey)
+    def wait(forCmdHotkey: str = None, backend: InputBackend = None):
+        (backend or KeyboardBackend()).wait(forCmdHotkey)
 
     @staticmethod
     def get(leaderHotkey: str = None) -> ShortcutManager:
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from array import array
+from time import perf_counter_ns
+
+
+# trace
+#   - (timestamp, step, candidates) per key, no strings anywhere
+#   - one flat array("q"), three slots a record, allocated up front
+#   - the oldest records get overwritten once it's full
+#   - dump/load are the raw array bytes, native endianness
+
+FIELDS = ("timestampNs", "step", "candidates")
+RECORD_SIZE = len(FIELDS)
+
+
+class KeyTrace:
+    """
+    What the manager was doing key by key, cheap enough to leave on
+
+    ex: manager = ShortcutManager("ctrl+up", options=ManagerOptions(trace=True))
+        ...
+        for timestampNs, step, candidates in manager.trace.records():
+            print(step, candidates)
+
+    step: keys into the chord, 0 is the command key
+    candidates: shortcuts still reachable after that key
+    """
+
+    capacity: int
+    buffer: array
+    index: int
+    count: int
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.buffer = array("q", bytes(8 * RECORD_SIZE * capacity))
+        self.index = 0
+        self.count = 0
+
+    def record(self, step: int, candidates: int):
+        slot = self.index * RECORD_SIZE
+        buffer = self.buffer
+
+        buffer[slot] = perf_counter_ns()
+        buffer[slot + 1] = step
+        buffer[slot + 2] = candidates
+
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+
+    def records(self) -> list[tuple[int, int, int]]:
+        """
+        Oldest first
+        """
+
+        held = min(self.count, self.capacity)
+        start = (self.index - held) % self.capacity
+
+        return [
+            tuple(self.buffer[slot * RECORD_SIZE : (slot + 1) * RECORD_SIZE])
+            for slot in ((start + offset) % self.capacity for offset in range(held))
+        ]
+
+    def dump(self, path: str):
+        """
+        Writes the records oldest first, read them back with KeyTrace.load
+        """
+
+        with open(path, "wb") as file:
+            array("q", (value for record in self.records() for value in record)).tofile(
+                file
+            )
+
+    @staticmethod
+    def load(path: str) -> list[tuple[int, int, int]]:
+        values = array("q")
+
+        with open(path, "rb") as file:
+            values.frombytes(file.read())
+
+        return [
+            tuple(values[slot : slot + RECORD_SIZE])
+            for slot in range(0, len(values), RECORD_SIZE)
+        ]
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def __repr__(self):
+        return f"KeyTrace(capacity={self.capacity}, recorded={self.count})"
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from typing import Callable, Literal
+
+
+# pool
+#   - a few long lived named threads pulling off one bounded queue
+#   - when the queue is full
+#       - "drop"   drops the new task straight away
+#       - "spawn"  gives it a thread of its own, at most maxSpawned at once, then drops
+#       - "block"  waits up to blockTimeout for room, then drops
+#       - "caller" runs the task on the submitting thread
+#   - the manager submits from the keyboard callback, "block" and "caller" stall
+#       the keyboard there, in hook mode that's every key on the system
+#   - shutdown lets the queue drain, then stops every worker and spawned thread
+
+
+type T_Backpressure = Literal["spawn", "block", "drop", "caller"]
+
+
+class WorkerPool:
+    name: str
+    backpressure: T_Backpressure
+    blockTimeout: float
+    maxSpawned: int
+
+    queue: Queue[tuple[Callable[[], None], str] | None]
+    workers: list[Thread]
+    # Threads "spawn" started for a full queue, kept so shutdown can join them
+    overflow: list[Thread]
+    isShutdown: bool
+
+    # Tasks thrown away because the queue was full
+    dropped: int
+    # Tasks that got their own thread because the queue was full
+    spawned: int
+
+    def __init__(
+        self,
+        workers: int = 2,
+        queueSize: int = 64,
+        name: str = "Shortcut-Worker",
+        backpressure: T_Backpressure = "drop",
+        blockTimeout: float = 0.5,
+        maxSpawned: int = 8,
+    ):
+        self.name = name
+        self.backpressure = backpressure
+        self.blockTimeout = blockTimeout
+        self.maxSpawned = maxSpawned
+
+        self.queue = Queue(maxsize=queueSize)
+        self.overflow = list()
+        self.isShutdown = False
+        self.dropped = 0
+        self.spawned = 0
+        self.lock = Lock()
+
+        self.workers = [
+            Thread(target=self.__work, name=f"{name}-{index}", daemon=True)
+            for index in range(max(workers, 1))
+        ]
+
+        for worker in self.workers:
+            worker.start()
+
+    def __work(self):
+        while True:
+            task = self.queue.get()
+
+            # Shutdown sentinel
+            if task is None:
+                return
+
+            self.__run(*task)
+
+    def __run(self, target: Callable[[], None], name: str):
+        try:
+            target()
+        except Exception:
+            logger.exception("Task '%s' failed", name)
+
+    def submit(self, target: Callable[[], None], name: str = "Task") -> bool:
+        """
+        Returns False if the task was dropped
+        """
+
+        if self.isShutdown:
+            logger.debug("Pool is shut down, dropping '%s'", name)
+            return False
+
+        try:
+            if self.backpressure == "block":
+                self.queue.put((target, name), timeout=self.blockTimeout)
+            else:
+                self.queue.put_nowait((target, name))
+
+            return True
+
+        except Full:
+            if self.backpressure == "caller":
+                self.__run(target, name)
+                return True
+
+            if self.backpressure == "spawn" and self.__spawn(target, name):
+                return True
+
+            self.dropped += 1
+            logger.warning("Queue full, dropped '%s' (%d so far)", name, self.dropped)
+            return False
+
+    def __spawn(self, target: Callable[[], None], name: str) -> bool:
+        with self.lock:
+            # Finished ones don't count against maxSpawned
+            self.overflow = [thread for thread in self.overflow if thread.is_alive()]
+
+            if len(self.overflow) >= self.maxSpawned:
+                return False
+
+            thread = Thread(
+                target=self.__run,
+                args=(target, name),
+                name=f"{self.name}-Spawned-{self.spawned}",
+                daemon=True,
+            )
+            # Started under the lock, a thread that isn't alive yet would get pruned
+            thread.start()
+            self.overflow.append(thread)
+            self.spawned += 1
+
+        logger.debug("Queue full, '%s' gets its own thread", name)
+        return True
+
+    def shutdown(self, wait: bool = True, timeout: float = None):
+        """
+        Stops taking tasks, lets what's queued finish, then stops the workers
+
+        wait=False throws away anything still queued
+        """
+
+        if self.isShutdown:
+            return
+
+        self.isShutdown = True
+
+        if not wait:
+            try:
+                while True:
+                    self.queue.get_nowait()
+            except Empty:
+                pass
+
+        for _ in self.workers:
+            self.queue.put(None)
+
+        if wait:
+            with self.lock:
+                overflow = list(self.overflow)
+
+            for thread in self.workers + overflow:
+                thread.join(timeout)
+
+
+logger = logging.getLogger("WorkerPool")
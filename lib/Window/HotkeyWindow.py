@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from threading import Event, Thread
-from tkinter import Label, Tk, Entry, Text, StringVar
+from threading import Event, Lock, Thread
+from tkinter import Label, Scrollbar, Tk, Entry, Text, StringVar
 import enum
 import logging
 import os
@@ -18,9 +18,58 @@ class T_WindowMessage(enum.Enum):
     SET_HELP_TEXT = 0
     SET_MACRO_INPUT = 1
     LIFT_WINDOW = 2
+    ICONIFY_WINDOW = 3
+
+
+# Messages in the same slot overwrite each other, only the latest gets rendered
+MESSAGE_SLOTS = {
+    T_WindowMessage.SET_HELP_TEXT: "helpText",
+    T_WindowMessage.SET_MACRO_INPUT: "macroInput",
+    T_WindowMessage.LIFT_WINDOW: "visibility",
+    T_WindowMessage.ICONIFY_WINDOW: "visibility",
+}
+
+# ~60 redraws a second at most
+PUMP_INTERVAL_MS = 16
+
+# Rows of candidates the help panel renders, the rest are scrolled to
+HELP_VISIBLE_LINES = 12
+HELP_WHEEL_LINES = 3
+
+
+class HelpSource:
+    """
+    What the help panel is showing, lines are only fetched for the rows on screen
+
+    fetch(offset, limit) -> the lines from offset, at most limit of them
+    """
+
+    title: str
+    total: int
+    fetch: Callable[[int, int], List[str]]
+
+    def __init__(self, title: str, total: int, fetch: Callable[[int, int], List[str]]):
+        self.title = title
+        self.total = total
+        self.fetch = fetch
+
+    @staticmethod
+    def fromText(value: str):
+        lines = value.splitlines()
+        return HelpSource(
+            "", len(lines), lambda offset, limit: lines[offset : offset + limit]
+        )
+
+    def __repr__(self):
+        return f"HelpSource(title='{self.title}', total={self.total})"
 
 
 class WindowMessage:
+    """
+    args can hold a zero argument callable instead of a value, it only gets
+        called if this is the message that ends up rendered
+    """
+
     type: T_WindowMessage
     args: Tuple
 
@@ -33,18 +82,18 @@ class WindowMessage:
 
 
 class WindowThreadWrapper:
+    # Posted from any thread, drained on the Tk thread by __pump
     preQueue: List[WindowMessage]
+    queueLock: Lock
     waiterThread: Thread
 
     windowThread: Thread
     windowRef: HotkeyWindow | None = None
 
-    postMessage: Callable[[T_WindowMessage], None] = None
-
     def __init__(self):
         self.preQueue = list()
+        self.queueLock = Lock()
 
-        logger.debug("Setting post message")
         logger.debug("Waiting for window reference, ORIGINAL")
 
         haveRefEvent = self.__generateEvent()
@@ -62,6 +111,7 @@ class WindowThreadWrapper:
             # Start window minimized
             self.windowRef.root.iconify()
 
+            self.windowRef.root.after(PUMP_INTERVAL_MS, self.__pump)
             self.windowRef.start()
 
         self.windowThread = Thread(
@@ -75,6 +125,69 @@ class WindowThreadWrapper:
     def __generateEvent(self):
         return Event()
 
+    def postMessage(self, type: T_WindowMessage, *args):
+        """
+        Safe from any thread, Tk is only ever touched from the window thread
+        """
+
+        with self.queueLock:
+            self.preQueue.append(WindowMessage(type, *args))
+
+    def setEntry(self, value: str):
+        self.postMessage(T_WindowMessage.SET_MACRO_INPUT, value)
+
+    def setHelpText(self, value: str | Callable[[], str]):
+        self.postMessage(T_WindowMessage.SET_HELP_TEXT, value)
+
+    def setHelpCandidates(
+        self, title: str, total: int, fetch: Callable[[int, int], List[str]]
+    ):
+        self.postMessage(T_WindowMessage.SET_HELP_TEXT, HelpSource(title, total, fetch))
+
+    def show(self):
+        self.postMessage(T_WindowMessage.LIFT_WINDOW)
+
+    def hide(self):
+        self.postMessage(T_WindowMessage.ICONIFY_WINDOW)
+
+    def __pump(self):
+        with self.queueLock:
+            messages, self.preQueue = self.preQueue, list()
+
+        # Last one in each slot wins, a burst of keys is one redraw
+        latest: dict[str, WindowMessage] = dict()
+        for message in messages:
+            slot = MESSAGE_SLOTS[message.type]
+            latest.pop(slot, None)
+            latest[slot] = message
+
+        for message in latest.values():
+            try:
+                self.__handleMessage(message)
+            except Exception:
+                logger.exception("Failed handling %s", message)
+
+        self.windowRef.root.after(PUMP_INTERVAL_MS, self.__pump)
+
+    def __handleMessage(self, message: WindowMessage):
+        args = [arg() if callable(arg) else arg for arg in message.args]
+
+        match message.type:
+            case T_WindowMessage.SET_HELP_TEXT if isinstance(args[0], HelpSource):
+                self.windowRef.updateHelpSource(*args)
+
+            case T_WindowMessage.SET_HELP_TEXT:
+                self.windowRef.updateHelpText(*args)
+
+            case T_WindowMessage.SET_MACRO_INPUT:
+                self.windowRef.updateEntry(*args)
+
+            case T_WindowMessage.LIFT_WINDOW:
+                self.windowRef.root.deiconify()
+
+            case T_WindowMessage.ICONIFY_WINDOW:
+                self.windowRef.root.iconify()
+
 
 class HotkeyWindow:
     root: Tk
@@ -83,6 +196,12 @@ class HotkeyWindow:
     entryValue: StringVar
 
     helpText: Text
+    helpScroll: Scrollbar
+
+    # Virtual scrolling, only HELP_VISIBLE_LINES rows ever live in the widget
+    helpSource: HelpSource
+    helpOffset: int
+    renderedLines: List[str]
 
     @property
     def helpTextValue(self):
@@ -106,12 +225,21 @@ class HotkeyWindow:
         )
         self.macroEntry.pack()
 
+        self.helpSource = HelpSource.fromText("")
+        self.helpOffset = 0
+        self.renderedLines = list()
+
+        self.helpScroll = Scrollbar(self.root, command=self.__onHelpScroll)
+        self.helpScroll.pack(side="right", fill="y")
+
         self.helpText = Text(
             self.root,
             font="monospace",
             relief="sunken",
             state="disabled",
+            height=HELP_VISIBLE_LINES + 1,
         )
+        self.helpText.bind("<MouseWheel>", self.__onHelpWheel)
         self.helpText.pack()
 
     def start(self):
@@ -122,7 +250,69 @@ class HotkeyWindow:
         self.macroEntry.setvar(Constants.MACRO_INPUT, value)
 
     def updateHelpText(self, value: str):
-        self.helpText.insert(1.0, value, "end")
+        self.updateHelpSource(HelpSource.fromText(value))
+
+    def updateHelpSource(self, source: HelpSource):
+        self.helpSource = source
+        self.helpOffset = 0
+        self.__renderHelp()
+
+    def __scrollHelpTo(self, offset: int):
+        lastOffset = max(self.helpSource.total - HELP_VISIBLE_LINES, 0)
+        offset = min(max(offset, 0), lastOffset)
+
+        if offset != self.helpOffset:
+            self.helpOffset = offset
+            self.__renderHelp()
+
+    def __onHelpScroll(self, action: str, amount: str, unit: str = None):
+        if action == "moveto":
+            self.__scrollHelpTo(round(float(amount) * self.helpSource.total))
+            return
+
+        step = HELP_VISIBLE_LINES if unit == "pages" else 1
+        self.__scrollHelpTo(self.helpOffset + int(amount) * step)
+
+    def __onHelpWheel(self, event):
+        direction = -1 if event.delta > 0 else 1
+        self.__scrollHelpTo(self.helpOffset + direction * HELP_WHEEL_LINES)
+
+        # Don't let the Text scroll itself on top of us
+        return "break"
+
+    def __renderHelp(self):
+        source = self.helpSource
+
+        lines = source.fetch(self.helpOffset, HELP_VISIBLE_LINES)
+        if source.title:
+            lines = [f"{source.title} ({source.total}):", *lines]
+
+        self.helpText.configure(state="normal")
+
+        # Only rewrite the rows that changed since last time
+        for row, line in enumerate(lines[: len(self.renderedLines)], start=1):
+            if self.renderedLines[row - 1] != line:
+                self.helpText.delete(f"{row}.0", f"{row}.end")
+                self.helpText.insert(f"{row}.0", line)
+
+        appended = lines[len(self.renderedLines) :]
+        for row, line in enumerate(appended, start=len(self.renderedLines)):
+            self.helpText.insert("end-1c", f"\n{line}" if row else line)
+
+        if len(lines) < len(self.renderedLines):
+            start = f"{len(lines)}.end" if lines else "1.0"
+            self.helpText.delete(start, "end-1c")
+
+        self.helpText.configure(state="disabled")
+        self.renderedLines = lines
+
+        if source.total:
+            self.helpScroll.set(
+                self.helpOffset / source.total,
+                min(self.helpOffset + HELP_VISIBLE_LINES, source.total) / source.total,
+            )
+        else:
+            self.helpScroll.set(0, 1)
 
 
 logger = logging.getLogger("HotkeyWindow")
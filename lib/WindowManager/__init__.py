@@ -1,26 +1,36 @@
-# fmt: off
 import os
-from datetime import datetime, timedelta
-from win32con import (
-    # Security Options
-    PROCESS_QUERY_INFORMATION,
-    PROCESS_VM_READ,
+from time import monotonic, sleep
 
-    # Process Options
-    PM_NOREMOVE,
+# fmt: off
+from .backends import (
+    HANDLE_ERROR_DESTRUCTIVE,
+    HANDLE_ERROR_STD_OUTPUT,
 
     # Window Messages
     SW_MINIMIZE,
     SW_MAXIMIZE,
     WM_CLOSE,
+
+    # Every win32 call goes through whatever backend is set
+    WindowBackend,
+    Win32Backend,
+    SimulatedDesktop,
+    getBackend,
+    setBackend,
 )
 # fmt: on
 
-HANDLE_ERROR_DESTRUCTIVE = 1
-HANDLE_ERROR_STD_OUTPUT = 2
+# Cached window table for searches in tight loops
+from .matchers import TitleMatcher
+from .registry import WindowEntry, WindowRegistry, windowRegistry
 
-from typing import Callable, Any, Iterable, Mapping, TypeVar
-from pywintypes import error as pywinError
+# One thread for every timer, tick and timeout in here
+from .scheduler import ScheduledTask, Scheduler, scheduler
+
+# One shared source of foreground / window created notifications
+from .events import Subscription, WindowEventHub, windowEvents
+
+from typing import Callable, Any, Iterable, Iterator, Literal, Mapping, TypeVar
 
 T = TypeVar("T")
 type WIN32_MESSAGE = int
@@ -31,88 +41,118 @@ class ThreadKill(Exception):
         super().__init__(message, *args)
 
 
-from dataclasses import dataclass, field, fields
-from threading import Thread, Event
-
-from win32api import OpenProcess, CloseHandle
-from win32gui import (
-    GetWindowText,
-    GetForegroundWindow,
-    EnumWindows,  # used in managers
-    SetForegroundWindow,
-    ShowWindow,
-    SendMessage,
-    PostMessage,
-    GetWindowRect,
-    SetWindowPos,
-)
-from win32process import (
-    GetWindowThreadProcessId,
-    AttachThreadInput,
-    GetModuleFileNameEx,
-)
+from dataclasses import dataclass, fields
+from functools import cached_property
+from collections import OrderedDict
+from threading import Event, Lock
+
+
+class EventLoop:
+    """
+    tick every interval until stopCheck() says so, stop() is called or the
+        timeout runs out. Every EventLoop shares the one scheduler thread,
+        so tick shouldn't sleep, that's what interval is for
 
+    ex: loop = EventLoop(poll, lambda: found.is_set(), timeoutSeconds=10, interval=0.5)
+        loop.start()
+        loop.join()
+
+    It used to be a Thread, of the old Thread arguments name and daemon are still
+        taken (daemon doesn't matter any more, the scheduler thread is one),
+        anything else is a TypeError instead of quietly landing in interval
+    """
 
-class EventLoop(Thread):
     def __init__(
         self,
         tick: Callable[[], None],
         stopCheck: Callable[[], bool] = None,
         timeoutSeconds: int = 10,
-        *args,
-        **kwargs,
+        *,
+        interval: float = 0.1,
+        name: str = None,
+        daemon: bool = None,
     ) -> None:
-        super().__init__(*args, **kwargs)
+        self.name = name or f"EventLoop-{id(self):x}"
+        self.daemon = True if daemon is None else daemon
+
         if stopCheck != None:
             self.stopCheck = stopCheck
         else:
             self.stopCheck = lambda: False
 
         self.tick = tick
+        self.timeoutSeconds = timeoutSeconds
+        self.interval = interval
 
-        self.__stopAt__ = datetime.now() + timedelta(seconds=timeoutSeconds)
+        self.task: ScheduledTask | None = None
         self.stopFlag = Event()
         self.isStopped = self.stopFlag.is_set
         self.didTimeout = False
 
-    def __stopCheck__(self):
-        nowTime = datetime.now() >= self.__stopAt__
-        if nowTime:
-            self.didTimeout = True
-
-        return any(
-            [
-                nowTime,
-                self.stopCheck(),
-                self.stopFlag.is_set(),
-            ]
+    def __onDone(self, task: ScheduledTask):
+        self.didTimeout = task.didTimeout
+        self.stopFlag.set()
+
+    def start(self):
+        self.task = scheduler.every(
+            self.interval,
+            self.tick,
+            stopCheck=self.stopCheck,
+            timeout=self.timeoutSeconds,
+            onDone=self.__onDone,
         )
 
     def stop(self):
-        if self.stopFlag.is_set():
-            return
+        # Nothing to wait out, the next tick just never happens
+        if self.task is not None:
+            self.task.cancel()
 
         self.stopFlag.set()
-        self.join()
 
-    def run(self):
-        while self.__stopCheck__() == False:
-            self.tick()
+    def join(self, timeout: float = None):
+        return self.stopFlag.wait(timeout)
+
+    def is_alive(self):
+        return self.task is not None and not self.stopFlag.is_set()
 
 
 class State:
 
-    def __init__(self, inital=None, setHandler: Callable[[T, T], T] = None) -> None:
+    def __init__(
+        self,
+        inital=None,
+        setHandler: Callable[[T, T], T] = None,
+        mode: Literal["set", "append", "reduce"] = "set",
+    ) -> None:
         """
         setHandler: function(curVal, prevVal) -> newValue
 
         ex: setHandler = lambda prev, set: return list([*prev, set])
 
         Now we have a State that will append instead of overwriting, for an accumulator
+
+        mode:
+            "set": the default, setHandler if there is one, otherwise overwrite
+            "append": val is a list and setVal appends to it in place
+            "reduce": setHandler is a reducer that's free to mutate curVal
+
+        ex: State.appending() is the accumulator above without copying the list every time
         """
 
+        if mode == "append" and inital is None:
+            inital = list()
+
         self.val = inital
         self.setHandler = setHandler
+        self.mode = mode
+
+    @staticmethod
+    def appending(inital: list = None):
+        return State(inital, mode="append")
+
+    @staticmethod
+    def reducing(reducer: Callable[[T, Any], T], inital=None):
+        return State(inital, setHandler=reducer, mode="reduce")
 
     def __eq__(self, value: object) -> bool:
         return self.val == value
@@ -121,6 +161,10 @@ class State:
         return self.val or None
 
     def setVal(self, to):
+        if self.mode == "append":
+            self.val.append(to)
+            return
+
         if self.setHandler:
             self.val = self.setHandler(self.val, to)
             return
@@ -184,14 +228,18 @@ class EmptyString(str):
         return "__EMPTY_STRING__"
 
 
-@dataclass
 class Window:
+    """
+    Only the hwnd, threadID and processID are read up front,
+        windowTitle, exePath and windowRect are fetched the first time they're
+        used and cached until refresh()
+    """
+
     hwnd: int
     threadID: int
     processID: int
-    windowTitle: str = field(default_factory=str)
-    exePath: str = field(default_factory=str)
-    windowRect: Rect = None
+
+    LAZY_FIELDS = ("windowTitle", "exePath", "windowRect")
 
     class HandleManager:
         def __init__(self, windowObject) -> None:
@@ -199,46 +247,86 @@ class Window:
             self.handle = None
 
         def __enter__(self):
-            try:
-                self.handle = OpenProcess(
-                    PROCESS_QUERY_INFORMATION | PROCESS_VM_READ,
-                    False,
-                    self.windowObject.processID,
-                )
-            except pywinError as e:
-                __pywinIsError__(e, OpenProcess)
-                return None
-
+            self.handle = getBackend().openProcess(self.windowObject.processID)
             return self.handle
 
         def __exit__(self, *args):
-            CloseHandle(self.handle)
+            if self.handle is not None:
+                getBackend().closeHandle(self.handle)
 
-    def __post_init__(self):
+    def __init__(
+        self,
+        hwnd: int,
+        threadID: int,
+        processID: int,
+        windowTitle: str = None,
+        exePath: str = None,
+        windowRect: Rect = None,
+    ):
+        self.hwnd = hwnd
+        self.threadID = threadID
+        self.processID = processID
+
+        # Whatever we were handed is already cached, the rest waits
+        if windowTitle:
+            self.windowTitle = windowTitle
+
+        if exePath:
+            self.exePath = exePath
+
+        if windowRect is not None:
+            self.windowRect = windowRect
+
+    @cached_property
+    def windowTitle(self) -> str:
+        windowTitle = getBackend().getWindowText(self.hwnd)
+
+        # If we set it to an EmptyString object, when we search our ignore
+        #   list for the EmptyString and we can be sure it won't match
+        if windowTitle == "":
+            return EmptyString
 
+        return windowTitle
+
+    @cached_property
+    def exePath(self) -> str:
         # Show me the difference between an HWND and and HANDLE and
         #   I'll let you know where the door is.
         #
         # Whoever decided they are different things is not welcome here
-        canGetHandle = self.getHandle()
-        if None != canGetHandle.handle:
-            with self.getHandle() as _handle:
-                self.exePath = GetModuleFileNameEx(_handle, 0)
-                CloseHandle(_handle)
+        with self.getHandle() as _handle:
+            if _handle is None:
+                return ""
 
-        if not self.windowTitle:
-            self.windowTitle = GetWindowText(self.hwnd)
+            exePath = getBackend().getModuleFileName(_handle)
 
-        # If we set it to an EmptyString object, when we search our ignore
-        #   list for the EmptyString and we can be sure it won't match
-        if self.windowTitle == "":
-            self.windowTitle = EmptyString
+        # The next Window for this hwnd skips all of the above
+        windowMemo.remember(self.hwnd, self.threadID, self.processID, exePath)
+        return exePath
+
+    @cached_property
+    def windowRect(self) -> Rect:
+        rect = getBackend().getWindowRect(self.hwnd)
+        if rect is None:
+            return Rect(None, None, None, None)
+
+        return Rect(*rect)
+
+    def refresh(self):
+        """
+        Forgets the cached title, exe path and rect, they're read again on next use
+        """
+
+        for name in self.LAZY_FIELDS:
+            self.__dict__.pop(name, None)
+
+        return self
 
-        try:
-            self.windowRect = Rect(*GetWindowRect(self.hwnd))
-        except pywinError as e:
-            __pywinIsError__(e, GetWindowRect)
-            self.windowRect = Rect(None, None, None, None)
+    def __repr__(self):
+        return (
+            f"Window(hwnd={self.hwnd}, threadID={self.threadID}, "
+            f"processID={self.processID}, windowTitle={self.windowTitle!r})"
+        )
 
     def __eq__(self, value: object) -> bool:
         return (self.windowTitle, self.hwnd) == value
@@ -247,13 +335,11 @@ class Window:
         w = self.windowRect.right - self.windowRect.left
         h = self.windowRect.bottom - self.windowRect.top
 
-        SetWindowPos(
+        getBackend().setWindowPos(
             self.hwnd,
-            0,
             *list(self.windowRect)[:-2],
             w,
             h,
-            0,
         )
 
     def tryActivate(
@@ -266,28 +352,30 @@ class Window:
     ):
         "kwarg: retryLimit"
 
-        # TODO: Happens on return here
-        foregroundWindow = getForegroundWindowAsObject()
+        # Only the threadID is needed, no Window for it
+        _, foregroundThreadID, _ = getForegroundWindowInfo()
 
         if tryThreadAttach:
-            tryAttachThread(foregroundWindow.threadID, self.threadID)
-
-        try:
-            # By min and max-ing we make sure it truly is on the foreground
-            if withMinimize:
-                ShowWindow(self.hwnd, SW_MINIMIZE)  # 6 minimize
-                ShowWindow(self.hwnd, SW_MAXIMIZE)  # 3 maximize
-                self.__set_window_to_original_pos__()
-
-            SetForegroundWindow(self.hwnd)
-        except pywinError as e:
-            # handle the failed to set foreground error
-            __pywinIsError__(e, SetForegroundWindow)
-            __pywinIsError__(e, ShowWindow)
+            tryAttachThread(foregroundThreadID, self.threadID)
+
+        backend = getBackend()
+
+        # By min and max-ing we make sure it truly is on the foreground
+        if withMinimize:
+            if not (
+                backend.showWindow(self.hwnd, SW_MINIMIZE)  # 6 minimize
+                and backend.showWindow(self.hwnd, SW_MAXIMIZE)  # 3 maximize
+            ):
+                return False
+
+            self.__set_window_to_original_pos__()
+
+        # Backend already handled the failed to set foreground error
+        if not backend.setForegroundWindow(self.hwnd):
             return False
 
         # Sometime it takes just a little longer than it should to raise the window
-        # so we do this a little
+        # so we do this a little, one getForegroundWindow a go
         for _ in range(kwargs.get("retryLimit", 5)):
             if self.isForeground():
                 break
@@ -299,12 +387,30 @@ class Window:
         return self.isForeground()
 
     def isForeground(self):
-        foreGround = getForegroundWindowAsObject()
+        backend = getBackend()
+        foregroundHwnd = backend.getForegroundWindow()
 
-        if foreGround.hwnd == self.hwnd or foreGround.windowTitle == self.windowTitle:
+        if foregroundHwnd == self.hwnd:
             return True
 
-        return False
+        # Same title counts too, only read when the hwnd didn't match
+        return backend.getWindowText(foregroundHwnd) == self.windowTitle
+
+    def waitForeground(self, timeout: float = 0.2, interval: float = 0.01):
+        """
+        Returns True as soon as the window is on the foreground,
+            False if it still isn't after timeout seconds
+        """
+
+        deadline = monotonic() + timeout
+
+        while not self.isForeground():
+            if monotonic() >= deadline:
+                return False
+
+            sleep(interval)
+
+        return True
 
     def getHandle(self):
         """
@@ -328,56 +434,100 @@ class Window:
         lParam: Any = None,
         tryWaitForMessageToProcess: bool = True,
     ):
-        isError = False
-
         if tryWaitForMessageToProcess:
-            try:
-                SendMessage(self.hwnd, message, wParam, lParam)
+            isError = not getBackend().sendMessage(self.hwnd, message, wParam, lParam)
+            return isError
 
-            except pywinError as e:
-                __pywinIsError__(e, SendMessage)
-                isError = True
+        isError = not getBackend().postMessage(self.hwnd, message, wParam, lParam)
+        return isError
 
-            finally:
-                return isError
 
-        try:
-            PostMessage(self.hwnd, message, wParam, lParam)
+class WindowMemo:
+    """
+    What stays put for a window's whole life, keyed by hwnd: its exe path.
+        A hit only counts if the threadID and processID still match, hwnds get reused
 
-        except pywinError as e:
-            __pywinIsError__(e, PostMessage)
-            isError = True
+    get always hands back a new Window, the title and rect are read fresh from
+        that, only the exe path (a process handle and a syscall) is remembered
+    """
 
-        finally:
-            return isError
+    size: int
+    # hwnd -> (threadID, processID, exePath)
+    exePaths: OrderedDict[int, tuple[int, int, str]]
 
+    def __init__(self, size: int = 256):
+        self.size = size
+        self.lock = Lock()
+        self.backend: WindowBackend | None = None
+        self.exePaths = OrderedDict()
 
-def __pywinIsError__(
-    _pywinError: pywinError, function: Callable, behavior: int = HANDLE_ERROR_STD_OUTPUT
-):
-    # Get the Literal Name of the callable and see if that's our error
-    if _pywinError.funcname != function.__name__:
-        if behavior == HANDLE_ERROR_DESTRUCTIVE:
-            raise _pywinError
-        elif behavior == HANDLE_ERROR_STD_OUTPUT:
-            # A little non-destructive mode too
-            print(_pywinError)
-        else:
-            raise NotImplementedError(f"Unknown option 'behavior={behavior}'")
+    def clear(self):
+        with self.lock:
+            self.exePaths.clear()
+
+    def __checkBackend(self):
+        backend = getBackend()
+        if backend is not self.backend:
+            self.backend = backend
+            self.exePaths.clear()
+
+    def exePathFor(self, hwnd: int, threadID: int, processID: int) -> str | None:
+        with self.lock:
+            self.__checkBackend()
+
+            known = self.exePaths.get(hwnd)
+            if known is None or known[:2] != (threadID, processID):
+                return None
+
+            self.exePaths.move_to_end(hwnd)
+            return known[2]
+
+    def remember(self, hwnd: int, threadID: int, processID: int, exePath: str):
+        with self.lock:
+            self.__checkBackend()
+            self.exePaths[hwnd] = (threadID, processID, exePath)
+            self.exePaths.move_to_end(hwnd)
+
+            # Least recently used goes first
+            if len(self.exePaths) > self.size:
+                self.exePaths.popitem(last=False)
+
+    def get(
+        self, hwnd: int, threadID: int, processID: int, windowText: str = None
+    ) -> Window:
+        return Window(
+            hwnd,
+            threadID,
+            processID,
+            windowText,
+            exePath=self.exePathFor(hwnd, threadID, processID),
+        )
+
+
+windowMemo = WindowMemo()
 
-    return
+
+def getForegroundWindowInfo() -> tuple[int, int, int]:
+    """
+    (hwnd, threadID, processID) of the foreground window, two calls and no Window
+    """
+
+    backend = getBackend()
+    hwnd = backend.getForegroundWindow()
+
+    return (hwnd, *backend.getWindowThreadProcessId(hwnd))
 
 
 def getForegroundWindowAsObject():
-    return getWindowAsObject(GetForegroundWindow())
+    return windowMemo.get(*getForegroundWindowInfo())
 
 
 def getWindowAsObject(hwnd: int, windowText: str = None):
     # GetWindowThreadProcessId returns the threadID and the processID
     #   so we just destructure it
-    return Window(hwnd, *GetWindowThreadProcessId(hwnd), windowText)
-    #                                                    ^
-    #                                          if there is no windowText, oh well
+    return windowMemo.get(hwnd, *getBackend().getWindowThreadProcessId(hwnd), windowText)
+    #                                                             ^
+    #                                                 if there is no windowText, oh well
 
 
 def tryAttachThread(thisThread: int, willBeAttachedToThisThread: int):
@@ -390,13 +540,6 @@ def tryAttachThread(thisThread: int, willBeAttachedToThisThread: int):
     if thisThread == willBeAttachedToThisThread:
         return True
 
-    try:
-        # No harm in handling it anyway, there is a chance the window will be
-        #   raised anyway, but that's on you if it fails
-        AttachThreadInput(thisThread, willBeAttachedToThisThread, True)
-
-    except pywinError as e:
-        __pywinIsError__(e, AttachThreadInput)
-        return False
-
-    return True
+    # No harm in handling it anyway, there is a chance the window will be
+    #   raised anyway, but that's on you if it fails
+    return getBackend().attachThreadInput(thisThread, willBeAttachedToThisThread)
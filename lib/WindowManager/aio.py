@@ -0,0 +1,69 @@
+import asyncio
+
+from . import Window, windowEvents
+from .managers import event_windowCreated
+
+
+# asyncio
+#   - same windowEvents subscriptions as the callback API, no thread per wait
+#   - the hub's dispatcher thread hands results over with call_soon_threadsafe
+#   - a timeout or a cancelled task stops the subscription
+
+
+def __futureSetter(future: asyncio.Future):
+    loop = future.get_loop()
+
+    def setResult(window: Window):
+        if not future.done():
+            future.set_result(window)
+
+    # Called on the hub's dispatcher thread
+    return lambda window: loop.call_soon_threadsafe(setResult, window)
+
+
+async def __awaitSubscription(future: asyncio.Future, subscription, timeout: float | None):
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except TimeoutError:
+        return None
+    finally:
+        subscription.stop()
+
+
+async def waitForWindow(
+    keyword: str,
+    ignore: list | str = None,
+    exact: bool = False,
+    timeout: float | None = 10,
+) -> Window | None:
+    """
+    The first window matching the search, already open or opened before timeout,
+        None if it never showed
+
+    ex: notepad = await waitForWindow("Notepad", ignore="Notepad++")
+    """
+
+    future = asyncio.get_running_loop().create_future()
+
+    subscription = event_windowCreated(
+        __futureSetter(future),
+        {"keyword": keyword, "ignore": ignore, "exact": exact},
+        # The future's timeout is the one that counts
+        timeout=None,
+    )
+
+    return await __awaitSubscription(future, subscription, timeout)
+
+
+async def foregroundChanged(timeout: float | None = None) -> Window | None:
+    """
+    The next window to come to the foreground, None on timeout
+
+    ex: while window := await foregroundChanged():
+            print(window.windowTitle)
+    """
+
+    future = asyncio.get_running_loop().create_future()
+    subscription = windowEvents.subscribe("foreground", __futureSetter(future), once=True)
+
+    return await __awaitSubscription(future, subscription, timeout)
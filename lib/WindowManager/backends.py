@@ -0,0 +1,614 @@
+import os
+import threading
+
+from collections import Counter
+from time import monotonic, sleep
+from typing import Any, Callable
+
+from .scheduler import scheduler
+
+HANDLE_ERROR_DESTRUCTIVE = 1
+HANDLE_ERROR_STD_OUTPUT = 2
+
+# Win32 values, every backend speaks them so Window doesn't have to care
+SW_MINIMIZE = 6
+SW_MAXIMIZE = 3
+WM_CLOSE = 0x0010
+
+# SetWinEventHook events the event hub cares about
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_NAMECHANGE = 0x800C
+
+
+# backend
+#   - everything Window and the managers need from a window system
+#       - enumerate, title, foreground, rect, process info, messages
+#   - methods never raise for "the OS said no", they return False / None
+#   - watchEvents is optional, None means "poll me"
+#
+#   - Win32Backend is the real deal, wraps pywin32
+#   - SimulatedDesktop holds N fake windows with a configurable syscall cost
+
+
+class WindowBackend:
+    def enumWindows(self) -> list[int]:
+        """
+        Every top level hwnd, in z-order
+        """
+        raise NotImplementedError()
+
+    def getWindowText(self, hwnd: int) -> str:
+        raise NotImplementedError()
+
+    def getForegroundWindow(self) -> int:
+        raise NotImplementedError()
+
+    def setForegroundWindow(self, hwnd: int) -> bool:
+        raise NotImplementedError()
+
+    def showWindow(self, hwnd: int, command: int) -> bool:
+        raise NotImplementedError()
+
+    def getWindowRect(self, hwnd: int) -> tuple[int, int, int, int] | None:
+        raise NotImplementedError()
+
+    def setWindowPos(self, hwnd: int, x: int, y: int, width: int, height: int) -> bool:
+        raise NotImplementedError()
+
+    def getWindowThreadProcessId(self, hwnd: int) -> tuple[int, int]:
+        """
+        (threadID, processID), same order as Win32
+        """
+        raise NotImplementedError()
+
+    def attachThreadInput(self, thisThread: int, toThread: int) -> bool:
+        raise NotImplementedError()
+
+    def openProcess(self, processID: int) -> Any | None:
+        raise NotImplementedError()
+
+    def closeHandle(self, handle: Any):
+        raise NotImplementedError()
+
+    def getModuleFileName(self, handle: Any) -> str:
+        raise NotImplementedError()
+
+    def sendMessage(self, hwnd: int, message: int, wParam: Any, lParam: Any) -> bool:
+        raise NotImplementedError()
+
+    def postMessage(self, hwnd: int, message: int, wParam: Any, lParam: Any) -> bool:
+        raise NotImplementedError()
+
+    def watchEvents(
+        self, onEvent: Callable[[str, int], None]
+    ) -> Callable[[], None] | None:
+        """
+        Starts pushing ("foreground" | "created" | "destroyed" | "titleChanged", hwnd)
+            into onEvent from whatever thread, returns the function that stops it
+
+        None if there's nothing better than polling, which is the default
+        """
+        return None
+
+
+class Win32Backend(WindowBackend):
+    def __init__(self):
+        # Imported here so the rest of the package can be imported off Windows
+        import win32api
+        import win32con
+        import win32gui
+        import win32process
+        import pywintypes
+
+        self.win32api = win32api
+        self.win32con = win32con
+        self.win32gui = win32gui
+        self.win32process = win32process
+        self.pywinError = pywintypes.error
+
+    def enumWindows(self):
+        handles = []
+        self.win32gui.EnumWindows(lambda hwnd, _: handles.append(hwnd), None)
+        return handles
+
+    def getWindowText(self, hwnd: int):
+        return self.win32gui.GetWindowText(hwnd)
+
+    def getForegroundWindow(self):
+        return self.win32gui.GetForegroundWindow()
+
+    def setForegroundWindow(self, hwnd: int):
+        try:
+            self.win32gui.SetForegroundWindow(hwnd)
+        except self.pywinError as e:
+            # handle the failed to set foreground error
+            __pywinIsError__(e, self.win32gui.SetForegroundWindow)
+            return False
+
+        return True
+
+    def showWindow(self, hwnd: int, command: int):
+        try:
+            self.win32gui.ShowWindow(hwnd, command)
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32gui.ShowWindow)
+            return False
+
+        return True
+
+    def getWindowRect(self, hwnd: int):
+        try:
+            return self.win32gui.GetWindowRect(hwnd)
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32gui.GetWindowRect)
+            return None
+
+    def setWindowPos(self, hwnd: int, x: int, y: int, width: int, height: int):
+        try:
+            self.win32gui.SetWindowPos(hwnd, 0, x, y, width, height, 0)
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32gui.SetWindowPos)
+            return False
+
+        return True
+
+    def getWindowThreadProcessId(self, hwnd: int):
+        return self.win32process.GetWindowThreadProcessId(hwnd)
+
+    def attachThreadInput(self, thisThread: int, toThread: int):
+        try:
+            self.win32process.AttachThreadInput(thisThread, toThread, True)
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32process.AttachThreadInput)
+            return False
+
+        return True
+
+    def openProcess(self, processID: int):
+        try:
+            return self.win32api.OpenProcess(
+                self.win32con.PROCESS_QUERY_INFORMATION | self.win32con.PROCESS_VM_READ,
+                False,
+                processID,
+            )
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32api.OpenProcess)
+            return None
+
+    def closeHandle(self, handle: Any):
+        self.win32api.CloseHandle(handle)
+
+    def getModuleFileName(self, handle: Any):
+        try:
+            return self.win32process.GetModuleFileNameEx(handle, 0)
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32process.GetModuleFileNameEx)
+            return ""
+
+    def sendMessage(self, hwnd: int, message: int, wParam: Any, lParam: Any):
+        try:
+            self.win32gui.SendMessage(hwnd, message, wParam, lParam)
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32gui.SendMessage)
+            return False
+
+        return True
+
+    def postMessage(self, hwnd: int, message: int, wParam: Any, lParam: Any):
+        try:
+            self.win32gui.PostMessage(hwnd, message, wParam, lParam)
+        except self.pywinError as e:
+            __pywinIsError__(e, self.win32gui.PostMessage)
+            return False
+
+        return True
+
+    def watchEvents(self, onEvent: Callable[[str, int], None]):
+        # pywin32 doesn't wrap SetWinEventHook, ctypes it is
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        WINEVENT_OUTOFCONTEXT = 0x0000
+        WINEVENT_SKIPOWNPROCESS = 0x0002
+        OBJID_WINDOW = 0
+        CHILDID_SELF = 0
+        GA_ROOT = 2
+        WM_QUIT = 0x0012
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HMODULE,
+            WinEventProc,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        ]
+        user32.GetAncestor.restype = wintypes.HWND
+
+        events = {
+            EVENT_SYSTEM_FOREGROUND: "foreground",
+            EVENT_OBJECT_SHOW: "created",
+            EVENT_OBJECT_DESTROY: "destroyed",
+            EVENT_OBJECT_NAMECHANGE: "titleChanged",
+        }
+
+        def onWinEvent(hook, event, hwnd, idObject, idChild, thread, time):
+            # Every button and caret fires these too, only whole top level windows count
+            if not hwnd or idObject != OBJID_WINDOW or idChild != CHILDID_SELF:
+                return
+
+            # Out of context hooks arrive late, a destroyed window is already gone and
+            #   GetAncestor would give 0. So destroys of child windows get through too
+            if (
+                event not in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_DESTROY)
+                and user32.GetAncestor(hwnd, GA_ROOT) != hwnd
+            ):
+                return
+
+            onEvent(events[event], hwnd)
+
+        # Has to outlive the hooks or Windows calls into freed memory
+        callback = WinEventProc(onWinEvent)
+        started = threading.Event()
+        hookThreadID = []
+
+        def pump():
+            hookThreadID.append(kernel32.GetCurrentThreadId())
+
+            # Out of context hooks are delivered through this thread's message queue
+            hooks = [
+                user32.SetWinEventHook(
+                    low,
+                    high,
+                    0,
+                    callback,
+                    0,
+                    0,
+                    WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+                )
+                for low, high in [
+                    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+                    (EVENT_OBJECT_DESTROY, EVENT_OBJECT_SHOW),
+                    (EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE),
+                ]
+            ]
+            started.set()
+
+            message = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(message), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(message))
+                user32.DispatchMessageW(ctypes.byref(message))
+
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+
+        thread = threading.Thread(target=pump, name="Window-Event-Hook", daemon=True)
+        thread.start()
+        started.wait()
+
+        def unwatch():
+            user32.PostThreadMessageW(hookThreadID[0], WM_QUIT, 0, 0)
+
+            if thread is not threading.current_thread():
+                thread.join(1)
+
+        return unwatch
+
+
+def __pywinIsError__(
+    _pywinError: Exception, function: Callable, behavior: int = HANDLE_ERROR_STD_OUTPUT
+):
+    # Get the Literal Name of the callable and see if that's our error
+    if _pywinError.funcname != function.__name__:
+        if behavior == HANDLE_ERROR_DESTRUCTIVE:
+            raise _pywinError
+        elif behavior == HANDLE_ERROR_STD_OUTPUT:
+            # A little non-destructive mode too
+            print(_pywinError)
+        else:
+            raise NotImplementedError(f"Unknown option 'behavior={behavior}'")
+
+    return
+
+
+class SimulatedWindow:
+    hwnd: int
+    title: str
+    threadID: int
+    processID: int
+    exePath: str
+    rect: tuple[int, int, int, int]
+    minimized: bool
+
+    def __init__(
+        self,
+        hwnd: int,
+        title: str,
+        threadID: int,
+        processID: int,
+        exePath: str = "",
+        rect: tuple[int, int, int, int] = (0, 0, 800, 600),
+    ):
+        self.hwnd = hwnd
+        self.title = title
+        self.threadID = threadID
+        self.processID = processID
+        self.exePath = exePath
+        self.rect = rect
+        self.minimized = False
+
+    def __repr__(self):
+        return f"SimulatedWindow(hwnd={self.hwnd}, title='{self.title}')"
+
+
+class SimulatedDesktop(WindowBackend):
+    """
+    A pretend desktop for benchmarks and tests, no Windows required
+
+    ex: desktop = SimulatedDesktop(windows=500, syscallLatency=0.00002)
+        setBackend(desktop)
+        searchForWindowByTitle("Window 42")
+
+    syscallLatency: seconds every call pretends to cost
+    activationDelay: seconds between setForegroundWindow and the window being on top
+    nativeEvents: push window events like the Win32 hooks do, False to make
+        the event hub fall back to polling
+    calls: how many times each method was called
+    """
+
+    windows: dict[int, SimulatedWindow]
+    foreground: int
+    calls: Counter
+
+    def __init__(
+        self,
+        windows: int = 0,
+        syscallLatency: float = 0.0,
+        activationDelay: float = 0.0,
+        title: Callable[[int], str] = lambda index: f"Window {index}",
+        nativeEvents: bool = True,
+    ):
+        self.syscallLatency = syscallLatency
+        self.activationDelay = activationDelay
+        self.nativeEvents = nativeEvents
+        self.listeners: list[Callable[[str, int], None]] = list()
+
+        self.lock = threading.RLock()
+        self.windows = dict()
+        self.calls = Counter()
+        self.nextHwnd = 0x10000
+
+        # (hwnd, when it actually becomes foreground)
+        self.pendingForeground: tuple[int, float] | None = None
+
+        for index in range(windows):
+            self.addWindow(title(index))
+
+        self.foreground = next(iter(self.windows), 0)
+
+    def __syscall(self, name: str):
+        self.calls[name] += 1
+
+        if self.syscallLatency:
+            sleep(self.syscallLatency)
+
+    def __emit(self, event: str, hwnd: int):
+        # Never under self.lock, listeners are free to call back into us
+        for listener in list(self.listeners):
+            listener(event, hwnd)
+
+    def addWindow(self, title: str, exePath: str = "", processID: int = None) -> int:
+        with self.lock:
+            hwnd = self.nextHwnd
+            self.nextHwnd += 4
+
+            processID = processID or hwnd // 4
+            self.windows[hwnd] = SimulatedWindow(
+                hwnd, title, processID * 2, processID, exePath or f"C:\\sim\\{processID}.exe"
+            )
+
+        self.__emit("created", hwnd)
+        return hwnd
+
+    def removeWindow(self, hwnd: int):
+        with self.lock:
+            if self.windows.pop(hwnd, None) is None:
+                return
+
+            foregroundChanged = self.foreground == hwnd
+            if foregroundChanged:
+                self.foreground = next(iter(self.windows), 0)
+
+        self.__emit("destroyed", hwnd)
+
+        if foregroundChanged:
+            self.__emit("foreground", self.foreground)
+
+    def setTitle(self, hwnd: int, title: str):
+        with self.lock:
+            self.windows[hwnd].title = title
+
+        self.__emit("titleChanged", hwnd)
+
+    def watchEvents(self, onEvent: Callable[[str, int], None]):
+        if not self.nativeEvents:
+            return None
+
+        self.listeners.append(onEvent)
+        return lambda: self.listeners.remove(onEvent)
+
+    def __resolvePendingForeground(self) -> bool:
+        with self.lock:
+            if not self.pendingForeground or monotonic() < self.pendingForeground[1]:
+                return False
+
+            self.foreground = self.pendingForeground[0]
+            self.pendingForeground = None
+
+        self.__emit("foreground", self.foreground)
+        return True
+
+    def enumWindows(self):
+        self.__syscall("enumWindows")
+
+        with self.lock:
+            return list(self.windows)
+
+    def getWindowText(self, hwnd: int):
+        self.__syscall("getWindowText")
+
+        window = self.windows.get(hwnd)
+        return window.title if window else ""
+
+    def getForegroundWindow(self):
+        self.__syscall("getForegroundWindow")
+
+        self.__resolvePendingForeground()
+        return self.foreground
+
+    def setForegroundWindow(self, hwnd: int):
+        self.__syscall("setForegroundWindow")
+
+        with self.lock:
+            if hwnd not in self.windows:
+                return False
+
+            self.windows[hwnd].minimized = False
+
+            if self.activationDelay:
+                self.pendingForeground = (hwnd, monotonic() + self.activationDelay)
+
+                # Nobody might ask for the foreground, the events still have to happen
+                scheduler.callLater(self.activationDelay, self.__resolvePendingForeground)
+                return True
+
+            changed = self.foreground != hwnd
+            self.foreground = hwnd
+
+        if changed:
+            self.__emit("foreground", hwnd)
+
+        return True
+
+    def showWindow(self, hwnd: int, command: int):
+        self.__syscall("showWindow")
+
+        window = self.windows.get(hwnd)
+        if not window:
+            return False
+
+        window.minimized = command == SW_MINIMIZE
+        return True
+
+    def getWindowRect(self, hwnd: int):
+        self.__syscall("getWindowRect")
+
+        window = self.windows.get(hwnd)
+        return window.rect if window else None
+
+    def setWindowPos(self, hwnd: int, x: int, y: int, width: int, height: int):
+        self.__syscall("setWindowPos")
+
+        window = self.windows.get(hwnd)
+        if not window:
+            return False
+
+        window.rect = (x, y, x + width, y + height)
+        return True
+
+    def getWindowThreadProcessId(self, hwnd: int):
+        self.__syscall("getWindowThreadProcessId")
+
+        window = self.windows.get(hwnd)
+        return (window.threadID, window.processID) if window else (0, 0)
+
+    def attachThreadInput(self, thisThread: int, toThread: int):
+        self.__syscall("attachThreadInput")
+        return True
+
+    def openProcess(self, processID: int):
+        self.__syscall("openProcess")
+
+        # The processID is as good a handle as any
+        with self.lock:
+            for window in self.windows.values():
+                if window.processID == processID:
+                    return processID
+
+        return None
+
+    def closeHandle(self, handle: Any):
+        self.__syscall("closeHandle")
+
+    def getModuleFileName(self, handle: Any):
+        self.__syscall("getModuleFileName")
+
+        with self.lock:
+            for window in self.windows.values():
+                if window.processID == handle:
+                    return window.exePath
+
+        return ""
+
+    def sendMessage(self, hwnd: int, message: int, wParam: Any, lParam: Any):
+        self.__syscall("sendMessage")
+        return self.__handleMessage(hwnd, message)
+
+    def postMessage(self, hwnd: int, message: int, wParam: Any, lParam: Any):
+        self.__syscall("postMessage")
+        return self.__handleMessage(hwnd, message)
+
+    def __handleMessage(self, hwnd: int, message: int):
+        if hwnd not in self.windows:
+            return False
+
+        if message == WM_CLOSE:
+            self.removeWindow(hwnd)
+
+        return True
+
+
+__backend: WindowBackend | None = None
+
+
+def setBackend(backend: WindowBackend):
+    global __backend
+    __backend = backend
+
+
+def getBackend() -> WindowBackend:
+    """
+    The backend everything in lib.WindowManager goes through,
+        Win32 on Windows unless something else was set
+    """
+
+    global __backend
+
+    if __backend is None:
+        if os.name != "nt":
+            raise RuntimeError(
+                "No window backend for this platform, use setBackend(SimulatedDesktop(...))"
+            )
+
+        __backend = Win32Backend()
+
+    return __backend
@@ -0,0 +1,328 @@
+import logging
+
+from queue import SimpleQueue
+from threading import Event, Lock, Thread
+from typing import Callable, Literal, TYPE_CHECKING
+
+from .backends import WindowBackend, getBackend
+from .matchers import TitleMatcher
+from .registry import windowRegistry
+from .scheduler import ScheduledTask, scheduler
+
+if TYPE_CHECKING:
+    from . import Window
+
+
+type T_WindowEvent = Literal["foreground", "created", "destroyed", "titleChanged"]
+
+
+# hub
+#   - one event source for every subscriber in the process
+#       - the backend's own OS hooks if it has them (watchEvents)
+#       - otherwise one poller on the shared scheduler, only polling what somebody asked for
+#   - sources just queue (event, hwnd), one dispatcher thread fans it out
+#       - the Window is built once per event no matter how many subscribers
+#   - the same callback + event + matcher + once + timeout subscribed twice is one
+#     subscription, change any of them and it's a separate one
+#   - nobody subscribed, nothing running
+
+# Foreground checks are a single cheap call, aim for under a frame
+POLL_INTERVAL = 0.016
+
+
+class Subscription:
+    """
+    What subscribe hands back, quacks enough like the old EventLoop threads
+
+    ex: sub = windowEvents.subscribe("foreground", print, timeout=10)
+        sub.join()
+        sub.didTimeout  # True if it ran out the clock
+    """
+
+    event: T_WindowEvent
+    callback: Callable[["Window"], None]
+    matcher: TitleMatcher | None
+    once: bool
+    timeout: float | None
+    didTimeout: bool
+
+    def __init__(
+        self,
+        hub: "WindowEventHub",
+        event: T_WindowEvent,
+        callback: Callable[["Window"], None],
+        matcher: TitleMatcher | None,
+        once: bool,
+        timeout: float | None,
+    ):
+        self.hub = hub
+        self.event = event
+        self.callback = callback
+        self.matcher = matcher
+        self.once = once
+        self.timeout = timeout
+        self.didTimeout = False
+
+        self.stopFlag = Event()
+        self.deliverLock = Lock()
+
+        self.timer = None
+        if timeout is not None:
+            self.timer = scheduler.callLater(timeout, self.__expire)
+
+    @property
+    def key(self):
+        return (self.event, self.callback, self.matcher, self.once, self.timeout)
+
+    def __expire(self):
+        self.didTimeout = True
+        self.stop()
+
+    def deliver(self, window: "Window"):
+        # once subscriptions can race between the initial check and a live event
+        with self.deliverLock:
+            if self.stopFlag.is_set():
+                return
+
+            if self.once:
+                self.stop()
+
+        try:
+            self.callback(window)
+        except Exception:
+            logger.exception(f"Window event callback failed for {self}")
+
+    def stop(self):
+        if self.stopFlag.is_set():
+            return
+
+        self.stopFlag.set()
+
+        if self.timer is not None:
+            self.timer.cancel()
+
+        self.hub.unsubscribe(self)
+
+    def isStopped(self):
+        return self.stopFlag.is_set()
+
+    def is_alive(self):
+        return not self.stopFlag.is_set()
+
+    def join(self, timeout: float = None):
+        return self.stopFlag.wait(timeout)
+
+    def __repr__(self):
+        return f"Subscription(event='{self.event}', matcher={self.matcher}, once={self.once})"
+
+
+class WindowEventHub:
+    """
+    Window notifications for the whole process, use the windowEvents instance
+
+    ex: sub = windowEvents.subscribe("created", onNotepad, TitleMatcher("Notepad"), once=True)
+
+    "created" with a matcher also fires when an existing window gets renamed into a
+        match, windows tend to show up untitled and get their title a moment later
+    """
+
+    pollInterval: float
+    subscriptions: dict[tuple, Subscription]
+
+    def __init__(self, pollInterval: float = POLL_INTERVAL):
+        self.pollInterval = pollInterval
+
+        self.lock = Lock()
+        self.subscriptions = dict()
+        self.queue: SimpleQueue = SimpleQueue()
+
+        self.backend: WindowBackend | None = None
+        # Set while the backend's own hooks are feeding us
+        self.unwatch: Callable[[], None] | None = None
+        self.pollTask: ScheduledTask | None = None
+        # What the poller saw last time, None until something needs it
+        self.lastForeground: int | None = None
+        self.knownWindows: dict[int, str] | None = None
+        self.dispatchThread: Thread | None = None
+
+    def subscribe(
+        self,
+        event: T_WindowEvent,
+        callback: Callable[["Window"], None],
+        matcher: TitleMatcher = None,
+        once: bool = False,
+        timeout: float = None,
+    ) -> Subscription:
+        with self.lock:
+            existing = self.subscriptions.get((event, callback, matcher, once, timeout))
+            if existing is not None and not existing.isStopped():
+                return existing
+
+            subscription = Subscription(self, event, callback, matcher, once, timeout)
+            self.subscriptions[subscription.key] = subscription
+            self.__ensureRunning()
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            if self.subscriptions.get(subscription.key) is subscription:
+                del self.subscriptions[subscription.key]
+
+            if not self.subscriptions:
+                self.__stopSource()
+
+    def deliverTo(self, subscription: Subscription, window: "Window"):
+        """
+        Hands a window to one subscription on the dispatcher thread, same as a live event
+        """
+
+        self.queue.put((subscription, window))
+
+    def __wants(self, *events: T_WindowEvent):
+        return any(subscription.event in events for subscription in self.subscriptions.values())
+
+    def __ensureRunning(self):
+        if self.dispatchThread is None or not self.dispatchThread.is_alive():
+            self.dispatchThread = Thread(
+                target=self.__dispatch, name="Window-Event-Dispatch", daemon=True
+            )
+            self.dispatchThread.start()
+
+        backend = getBackend()
+
+        # Somebody swapped the desktop out from under us
+        if backend is not self.backend:
+            self.__stopSource()
+            self.backend = backend
+
+        if self.unwatch is not None:
+            return
+
+        if self.pollTask is not None and not self.pollTask.isDone():
+            return
+
+        self.unwatch = backend.watchEvents(self.__emit)
+
+        if self.unwatch is None:
+            self.lastForeground = None
+            self.knownWindows = None
+            self.pollTask = scheduler.every(
+                self.pollInterval, lambda: self.__poll(backend)
+            )
+
+    def __stopSource(self):
+        if self.unwatch is not None:
+            self.unwatch()
+            self.unwatch = None
+
+        if self.pollTask is not None:
+            self.pollTask.cancel()
+            self.pollTask = None
+
+    def __emit(self, event: T_WindowEvent, hwnd: int):
+        # Called from the OS hook or poller thread, don't do any work here
+        self.queue.put((event, hwnd))
+
+    def __poll(self, backend: WindowBackend):
+        with self.lock:
+            wantsForeground = self.__wants("foreground")
+            wantsWindows = self.__wants("created", "destroyed", "titleChanged")
+
+        if wantsForeground:
+            foreground = backend.getForegroundWindow()
+
+            if self.lastForeground is not None and foreground != self.lastForeground:
+                self.__emit("foreground", foreground)
+
+            self.lastForeground = foreground
+        else:
+            self.lastForeground = None
+
+        if wantsWindows:
+            known = self.knownWindows
+            # The registry already only re-reads what's new or stale, hwnd -> title
+            current = {entry.hwnd: entry.title for entry in windowRegistry.snapshot()}
+
+            if known is not None:
+                for hwnd, title in current.items():
+                    if hwnd not in known:
+                        self.__emit("created", hwnd)
+                    elif known[hwnd] != title:
+                        self.__emit("titleChanged", hwnd)
+
+                for hwnd in known.keys() - current.keys():
+                    self.__emit("destroyed", hwnd)
+
+            self.knownWindows = current
+        else:
+            self.knownWindows = None
+
+    def __dispatch(self):
+        from . import Window, windowMemo
+
+        while True:
+            first, second = self.queue.get()
+
+            if isinstance(first, Subscription):
+                first.deliver(second)
+                continue
+
+            event, hwnd = first, second
+            backend = self.backend
+
+            try:
+                if self.unwatch is not None:
+                    # Keep cached searches honest while the OS is telling us things
+                    windowRegistry.invalidate(hwnd if event == "titleChanged" else None)
+
+                with self.lock:
+                    if event in ("created", "titleChanged"):
+                        # Title matchers care about both, see the class docstring
+                        subscriptions = [
+                            subscription
+                            for subscription in self.subscriptions.values()
+                            if subscription.event == event
+                            or (subscription.event == "created" and subscription.matcher)
+                        ]
+                    else:
+                        subscriptions = [
+                            subscription
+                            for subscription in self.subscriptions.values()
+                            if subscription.event == event
+                        ]
+
+                if not subscriptions:
+                    continue
+
+                window: Window | None = None
+                title: str | None = None
+
+                for subscription in subscriptions:
+                    if subscription.matcher is not None:
+                        if title is None:
+                            title = backend.getWindowText(hwnd)
+
+                        if not subscription.matcher.matchesTitle(title):
+                            continue
+
+                    # One Window per event, shared by everyone who gets it
+                    if window is None:
+                        window = windowMemo.get(
+                            hwnd, *backend.getWindowThreadProcessId(hwnd), title or None
+                        )
+
+                    if subscription.matcher is not None and not subscription.matcher.matches(
+                        window
+                    ):
+                        continue
+
+                    subscription.deliver(window)
+
+            except Exception:
+                logger.exception(f"Failed dispatching {event} for {hwnd}")
+
+
+windowEvents = WindowEventHub()
+
+logger = logging.getLogger("WindowEvents")
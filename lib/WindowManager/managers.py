@@ -1,5 +1,6 @@
 from . import *
 
+from dataclasses import dataclass
 from threading import Thread
 from time import sleep
 
@@ -42,7 +43,7 @@ def watchWindow(windowSearchArgs: list, time: int, maxIter: int):
     haveWindow = None
 
     for _ in range(maxIter):
-        haveWindow = searchForWindowByTitle(*windowSearchArgs)
+        haveWindow = searchForWindowByTitle(*windowSearchArgs, cached=True)
 
         if haveWindow:
             break
@@ -54,21 +55,13 @@ def watchWindow(windowSearchArgs: list, time: int, maxIter: int):
 
 def event_foregroundWindowChanged(
     callback: Callable[[Window], None], timeout: int = 10
-):
-    curForeground = State(getForegroundWindowAsObject())
-
-    def eventTick():
-        newCurFore = getForegroundWindowAsObject()
-
-        if newCurFore != curForeground.val:
-            callback(newCurFore)
-            return
-
-        sleep(EVENT_RETRY_TIME)
+) -> Subscription:
+    """
+    callback gets every new foreground Window until timeout or .stop(),
+        everyone subscribed shares the one windowEvents source
+    """
 
-    threadHandle = EventLoop(eventTick, timeoutSeconds=timeout)
-    threadHandle.start()
-    return threadHandle
+    return windowEvents.subscribe("foreground", callback, timeout=timeout)
 
 
 def event_windowCreated(
@@ -76,93 +69,271 @@ def event_windowCreated(
     windowSearchKwargs: dict,
     windowSearchArgs: list = [],
     timeout: int = 10,
-):
-    haveWindow = State()
-
-    def eventTick():
-        haveWindow.setVal(
-            searchForWindowByTitle(
-                *windowSearchArgs,
-                **windowSearchKwargs,
-            )
-        )
-        if haveWindow.val != None:
-            callback(haveWindow.val)
-            return
+) -> Subscription:
+    """
+    callback gets the first Window matching the search, whether it's already
+        there or shows up before timeout. Same arguments as searchForWindowByTitle
+    """
 
-        sleep(EVENT_RETRY_TIME)
+    search = dict(zip(("keyword", "ignore", "exact"), windowSearchArgs))
+    search.update(windowSearchKwargs)
 
-    ret = EventLoop(eventTick, lambda: haveWindow.val != None, timeoutSeconds=timeout)
-    ret.start()
-    return ret
+    matcher = TitleMatcher(
+        search.get("keyword"),
+        search.get("ignore"),
+        mode="exact" if search.get("exact") else "substring",
+    )
+
+    # Subscribe first so nothing slips in between the check and the subscription
+    subscription = windowEvents.subscribe(
+        "created", callback, matcher, once=True, timeout=timeout
+    )
+
+    existing = searchForWindowByTitle(
+        search.get("keyword"), search.get("ignore"), search.get("exact"), cached=True
+    )
+    if existing is not None:
+        windowEvents.deliverTo(subscription, existing)
+
+    return subscription
 
 
 def searchForWindowsByTitle(
-    keyword: str, ignore: list | str = None, exact: bool = False
+    keyword: str, ignore: list | str = None, exact: bool = False, cached: bool = False
 ) -> list[Window]:
-    # A working example of a list State
-    listState = State(list(), setHandler=lambda cur, passed: list([*cur, passed]))
-    #                                                                   ^
-    #              Destructure what we have now, append the new value, return the new list
+    """
+    cached: read the shared windowRegistry instead of enumerating every window,
+        titles can be up to windowRegistry.titleTtl seconds old
+    """
+
+    # Appends in place, copying the list per match made N windows cost N^2
+    listState = State.appending()
 
     return __EnumWindows__(
         listState,
         keyword,
         ignore,
         exact,
+        cached=cached,
     )
 
 
 def searchForWindowByTitle(
-    keyword: str, ignore: list | str = None, exact: bool = False
+    keyword: str, ignore: list | str = None, exact: bool = False, cached: bool = False
 ) -> Window | None:
     singleState = State()
 
-    return __EnumWindows__(singleState, keyword, ignore, exact, breakOnFirst=True)
+    return __EnumWindows__(
+        singleState, keyword, ignore, exact, breakOnFirst=True, cached=cached
+    )
 
 
-def __EnumWindows__(
-    accumulator: State,
-    keyword: str,
-    ignore: list | str = None,
-    exact: bool = False,
-    breakOnFirst: bool = False,
-) -> Window | list[Window]:
-    if keyword == "":
-        return None
+@dataclass(frozen=True)
+class WindowQuery:
+    """
+    One target for searchForWindowsByTitles, same knobs as searchForWindow(s)ByTitle
+
+    breakOnFirst: the result is the first Window (or None) instead of a list
+    """
+
+    keyword: str
+    ignore: tuple[str, ...] = ()
+    exact: bool = False
+    breakOnFirst: bool = False
+
+    def __post_init__(self):
+        # Has to stay hashable, it's the key of the result
+        if isinstance(self.ignore, str):
+            object.__setattr__(self, "ignore", (self.ignore,))
+        elif not isinstance(self.ignore, tuple):
+            object.__setattr__(self, "ignore", tuple(self.ignore or ()))
+
+    def toMatcher(self):
+        return TitleMatcher(
+            self.keyword, list(self.ignore), mode="exact" if self.exact else "substring"
+        )
+
+
+def searchForWindowsByTitles(
+    queries: Iterable[WindowQuery | str], cached: bool = False
+) -> dict[WindowQuery | str, Window | list[Window] | None]:
+    """
+    Every query resolved from a single enumeration, a plain string is
+        WindowQuery(keyword) and stays the key in the result
+
+    Stops enumerating as soon as every query is breakOnFirst and has its window
+
+    ex: found = searchForWindowsByTitles([
+            WindowQuery("Notepad", ignore=("Notepad++",), breakOnFirst=True),
+            "Firefox",
+        ])
+        found["Firefox"]  # [Window(...), ...]
+    """
+
+    targets = {
+        query: query if isinstance(query, WindowQuery) else WindowQuery(query)
+        for query in queries
+    }
+
+    found: dict[WindowQuery | str, Window | list[Window] | None] = {
+        query: None if target.breakOnFirst else [] for query, target in targets.items()
+    }
+
+    # Same as __EnumWindows__, an empty keyword finds nothing
+    pending = [
+        (query, target, target.toMatcher())
+        for query, target in targets.items()
+        if target.keyword != ""
+    ]
+
+    if cached:
+        matched = windowRegistry.search([matcher for *_, matcher in pending])
+
+        for query, target, matcher in pending:
+            windows = [
+                Window(entry.hwnd, entry.threadID, entry.processID, entry.title)
+                for entry in matched[matcher]
+            ]
 
-    # If the window text contains __EMPTY_STRING__ something crazy is going on and thats on you
-    if not ignore:
-        ignore = EmptyString
+            if target.breakOnFirst:
+                found[query] = windows[0] if windows else None
+            else:
+                found[query] = windows
 
-    if type(ignore) != list:
-        ignore = [
-            ignore,
+        return found
+
+    backend = getBackend()
+
+    for hwnd in backend.enumWindows():
+        # Only breakOnFirst queries ever leave, so this is everyone being satisfied
+        if not pending:
+            break
+
+        winText = backend.getWindowText(hwnd)
+        if winText == "":
+            continue
+
+        window = None
+
+        for entry in list(pending):
+            query, target, matcher = entry
+
+            if not matcher.matchesTitle(winText):
+                continue
+
+            # Shared by every query this window satisfies
+            window = window or getWindowAsObject(hwnd, windowText=winText)
+
+            if target.breakOnFirst:
+                found[query] = window
+                pending.remove(entry)
+            else:
+                found[query].append(window)
+
+    return found
+
+
+def searchForWindowsMatching(
+    matchers: list[TitleMatcher], cached: bool = False
+) -> dict[TitleMatcher, list[Window]]:
+    """
+    Every matcher answered from one pass over the windows instead of one
+        enumeration each
+
+    cached: ask the shared windowRegistry's title index instead, titles can be
+        up to windowRegistry.titleTtl seconds old
+
+    ex: notepad, code = TitleMatcher("Notepad"), TitleMatcher(r"- Visual Studio Code$", mode="regex")
+        found = searchForWindowsMatching([notepad, code])
+        found[code]  # [Window(...), ...]
+    """
+
+    if cached:
+        entries = windowRegistry.search(matchers)
+    else:
+        backend = getBackend()
+        entries = {matcher: [] for matcher in matchers}
+
+        for hwnd in backend.enumWindows():
+            winText = backend.getWindowText(hwnd)
+            if winText == "":
+                continue
+
+            for matcher in matchers:
+                if matcher.matchesTitle(winText):
+                    entries[matcher].append(
+                        WindowEntry(hwnd, winText, *backend.getWindowThreadProcessId(hwnd), 0)
+                    )
+
+    found: dict[TitleMatcher, list[Window]] = dict()
+    for matcher, matched in entries.items():
+        windows = [
+            Window(entry.hwnd, entry.threadID, entry.processID, entry.title)
+            for entry in matched
         ]
 
+        # Only the title matches pay for the exe lookup
+        found[matcher] = [window for window in windows if matcher.matches(window)]
+
+    return found
+
+
+def iterWindowsByTitle(
+    keyword: str, ignore: list | str = None, exact: bool = False, cached: bool = False
+) -> Iterator[Window]:
+    """
+    Yields matches as they're found, stop iterating and no more titles get read
+
+    ex: for window in iterWindowsByTitle("Notepad"):
+            if window.exePath.endswith("notepad.exe"):
+                break
+    """
+
+    if keyword == "":
+        return
+
     # Sometimes the kwargs don't get destructored I haven't been able to figure out why tho
     if type(keyword) == dict:
         keyword = keyword.get("keyword")
 
-    exactComp = lambda this, that: this == that  #
-    fuzzyComp = lambda this, that: this in that  # I was proud to come up with this
-    useComp: Callable = exactComp if exact else fuzzyComp  #
+    # Compiled once here rather than re-checking the ignore list per window
+    matcher = TitleMatcher(keyword, ignore, mode="exact" if exact else "substring")
 
-    def enumProc(hwnd: int, accumulator: State):
-        # I like this too
-        if breakOnFirst and accumulator.hasVal():
-            return
+    if cached:
+        # Everything's already in memory and indexed, no syscalls unless the registry is stale
+        for entry in windowRegistry.search([matcher])[matcher]:
+            yield Window(entry.hwnd, entry.threadID, entry.processID, entry.title)
+
+        return
 
-        winText = GetWindowText(hwnd)
+    backend = getBackend()
+
+    for hwnd in backend.enumWindows():
+        winText = backend.getWindowText(hwnd)
         # Skip all blank windows, gotta go fast
         if winText == "":
-            return
+            continue
+
+        if matcher.matchesTitle(winText):
+            yield getWindowAsObject(hwnd, windowText=winText)
+
+
+def __EnumWindows__(
+    accumulator: State,
+    keyword: str,
+    ignore: list | str = None,
+    exact: bool = False,
+    breakOnFirst: bool = False,
+    cached: bool = False,
+) -> Window | list[Window]:
+    if keyword == "":
+        return None
+
+    for window in iterWindowsByTitle(keyword, ignore, exact, cached):
+        accumulator.setVal(window)
 
-        if useComp(keyword, winText) and not any(
-            [True for ig in ignore if str(ig) in winText]
-        ):
-            accumulator.setVal(getWindowAsObject(hwnd, windowText=winText))
-            return
+        # I like this too
+        if breakOnFirst:
+            break
 
-    EnumWindows(enumProc, accumulator)
     return accumulator.val  # Return the values we got from the State
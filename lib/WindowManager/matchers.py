@@ -0,0 +1,141 @@
+import re
+
+from typing import Literal, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import Window
+
+
+type T_MatchMode = Literal["substring", "exact", "regex"]
+
+# Titles are indexed by every 3 character slice, casefolded
+NGRAM_SIZE = 3
+
+
+def titleNgrams(title: str) -> set[str]:
+    title = title.casefold()
+    return {title[i : i + NGRAM_SIZE] for i in range(len(title) - NGRAM_SIZE + 1)}
+
+
+class TitleMatcher:
+    """
+    A window search compiled once, then run against as many titles as you like
+
+    ex: matcher = TitleMatcher("Notepad", ignore=["Notepad++"], caseSensitive=False)
+        matcher.matchesTitle("untitled - notepad")  # True
+
+    keyword: None matches every title, handy with exePath on its own
+    mode: "substring" (keyword in title), "exact" (keyword == title) or "regex"
+    ignore: substrings that rule a title out, same as the old ignore list
+    exePath: substring of the exe path, checked last since it costs a syscall
+    """
+
+    keyword: str | None
+    mode: T_MatchMode
+    caseSensitive: bool
+    exePath: str | None
+
+    def __init__(
+        self,
+        keyword: str | None,
+        ignore: list | str = None,
+        mode: T_MatchMode = "substring",
+        caseSensitive: bool = True,
+        exePath: str = None,
+    ):
+        self.keyword = keyword
+        self.mode = mode
+        self.caseSensitive = caseSensitive
+        self.exePath = exePath.casefold() if exePath else None
+
+        flags = 0 if caseSensitive else re.IGNORECASE
+
+        # Only one of these ends up set, neither for a None keyword
+        self.pattern = None
+        self.needle = None
+
+        match mode:
+            case "regex":
+                self.pattern = re.compile(keyword, flags) if keyword else None
+            case "exact" | "substring" if keyword:
+                self.needle = keyword if caseSensitive else keyword.casefold()
+
+        if ignore and type(ignore) != list:
+            ignore = [ignore]
+
+        # EmptyString is a sentinel for "ignore nothing", never a real substring
+        from . import EmptyString
+
+        ignore = [str(ig) for ig in (ignore or []) if ig is not EmptyString]
+
+        # One regex for the whole ignore list instead of a loop per title
+        self.ignorePattern = (
+            re.compile("|".join(re.escape(ig) for ig in ignore), flags)
+            if ignore
+            else None
+        )
+
+    def matchesTitle(self, title: str) -> bool:
+        if not title:
+            return False
+
+        if self.pattern is not None:
+            if not self.pattern.search(title):
+                return False
+
+        elif self.needle is not None:
+            compared = title if self.caseSensitive else title.casefold()
+
+            if self.mode == "exact":
+                if compared != self.needle:
+                    return False
+            elif self.needle not in compared:
+                return False
+
+        if self.ignorePattern is not None and self.ignorePattern.search(title):
+            return False
+
+        return True
+
+    def matches(self, window: "Window") -> bool:
+        if not self.matchesTitle(window.windowTitle):
+            return False
+
+        if self.exePath is not None and self.exePath not in window.exePath.casefold():
+            return False
+
+        return True
+
+    def ngrams(self) -> set[str] | None:
+        """
+        N-grams every matching title has to contain, None when we can't tell
+            and have to look at every title
+        """
+
+        if self.mode == "regex" or not self.needle or len(self.needle) < NGRAM_SIZE:
+            return None
+
+        return titleNgrams(self.needle)
+
+    @property
+    def key(self):
+        return (
+            self.keyword,
+            self.mode,
+            self.caseSensitive,
+            self.exePath,
+            self.ignorePattern.pattern if self.ignorePattern else None,
+        )
+
+    # Equal by what they match, so the same search subscribed twice is one subscription
+    def __eq__(self, value: object) -> bool:
+        return isinstance(value, TitleMatcher) and self.key == value.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return (
+            f"TitleMatcher(keyword={self.keyword!r}, mode='{self.mode}', "
+            f"caseSensitive={self.caseSensitive}, exePath={self.exePath!r})"
+        )
@@ -0,0 +1,215 @@
+from threading import RLock
+from time import monotonic
+
+from .backends import WindowBackend, getBackend
+from .matchers import TitleMatcher, titleNgrams
+
+
+# registry
+#   - hwnd -> title, threadID, processID
+#   - refresh
+#       - skipped entirely if the last one is younger than ttl
+#       - enumerates hwnds, drops the ones that are gone
+#       - only new windows and titles older than titleTtl hit the backend
+#   - searches read the table, no syscalls at all
+#       - titles are indexed by n-gram, a substring search only looks at
+#         windows that have every n-gram of the keyword
+
+
+class WindowEntry:
+    __slots__ = ("hwnd", "title", "threadID", "processID", "checkedAt")
+
+    hwnd: int
+    title: str
+    threadID: int
+    processID: int
+    checkedAt: float
+
+    def __init__(
+        self, hwnd: int, title: str, threadID: int, processID: int, checkedAt: float
+    ):
+        self.hwnd = hwnd
+        self.title = title
+        self.threadID = threadID
+        self.processID = processID
+        self.checkedAt = checkedAt
+
+    def __repr__(self):
+        return (
+            f"WindowEntry(hwnd={self.hwnd}, title='{self.title}', "
+            f"threadID={self.threadID}, processID={self.processID})"
+        )
+
+
+class WindowRegistry:
+    """
+    Process wide cache of the top level windows, shared by every cached search
+
+    ex: for entry in windowRegistry.snapshot():
+            print(entry.hwnd, entry.title)
+
+    ttl: seconds a refresh is good for before we enumerate again
+    titleTtl: seconds a known window's title is trusted before it's read again
+    """
+
+    ttl: float
+    titleTtl: float
+
+    entries: dict[int, WindowEntry]
+    # Z-order from the last enumeration
+    order: list[WindowEntry]
+    position: dict[int, int]
+    # n-gram -> hwnds with it somewhere in their title
+    ngrams: dict[str, set[int]]
+    refreshedAt: float
+
+    def __init__(self, ttl: float = 0.1, titleTtl: float = 1.0):
+        self.ttl = ttl
+        self.titleTtl = titleTtl
+
+        self.lock = RLock()
+        self.backend: WindowBackend | None = None
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.entries = dict()
+            self.order = list()
+            self.position = dict()
+            self.ngrams = dict()
+            self.refreshedAt = float("-inf")
+
+    def invalidate(self, hwnd: int = None):
+        """
+        Forces the next refresh, and a fresh read of hwnd if given
+        """
+
+        with self.lock:
+            self.refreshedAt = float("-inf")
+
+            if hwnd is not None and hwnd in self.entries:
+                self.__unindex(self.entries.pop(hwnd))
+
+    def __index(self, entry: WindowEntry):
+        for gram in titleNgrams(entry.title):
+            self.ngrams.setdefault(gram, set()).add(entry.hwnd)
+
+    def __unindex(self, entry: WindowEntry):
+        for gram in titleNgrams(entry.title):
+            hwnds = self.ngrams.get(gram)
+
+            if hwnds is None:
+                continue
+
+            hwnds.discard(entry.hwnd)
+            if not hwnds:
+                del self.ngrams[gram]
+
+    def refresh(self, force: bool = False):
+        with self.lock:
+            backend = getBackend()
+
+            # Swapped desktops, nothing we know about is true anymore
+            if backend is not self.backend:
+                self.backend = backend
+                self.clear()
+
+            now = monotonic()
+            if not force and now - self.refreshedAt < self.ttl:
+                return
+
+            handles = backend.enumWindows()
+            entries: dict[int, WindowEntry] = dict()
+
+            for hwnd in handles:
+                entry = self.entries.get(hwnd)
+
+                if entry is None:
+                    entry = WindowEntry(
+                        hwnd,
+                        backend.getWindowText(hwnd),
+                        *backend.getWindowThreadProcessId(hwnd),
+                        now,
+                    )
+                    self.__index(entry)
+
+                elif now - entry.checkedAt >= self.titleTtl:
+                    title = backend.getWindowText(hwnd)
+
+                    if title != entry.title:
+                        self.__unindex(entry)
+                        entry.title = title
+                        self.__index(entry)
+
+                    entry.checkedAt = now
+
+                entries[hwnd] = entry
+
+            # Anything not enumerated this time is gone
+            for hwnd, entry in self.entries.items():
+                if hwnd not in entries:
+                    self.__unindex(entry)
+
+            self.entries = entries
+            self.order = list(entries.values())
+            self.position = {hwnd: index for index, hwnd in enumerate(entries)}
+            self.refreshedAt = now
+
+    def snapshot(self) -> list[WindowEntry]:
+        """
+        Every window we know of in z-order, refreshed first if it's gotten old
+        """
+
+        self.refresh()
+        return self.order
+
+    def get(self, hwnd: int) -> WindowEntry | None:
+        self.refresh()
+        return self.entries.get(hwnd)
+
+    def search(
+        self, matchers: list[TitleMatcher]
+    ) -> dict[TitleMatcher, list[WindowEntry]]:
+        """
+        Titles matching each matcher, in z-order. exePath isn't checked here,
+            that needs the process so it's left to whoever builds the Window
+
+        ex: found = windowRegistry.search([TitleMatcher("Notepad"), TitleMatcher("Code")])
+        """
+
+        self.refresh()
+
+        with self.lock:
+            found = {matcher: [] for matcher in matchers}
+            # The ones the index can't narrow down share a single pass
+            unindexed: list[TitleMatcher] = []
+
+            for matcher in matchers:
+                grams = matcher.ngrams()
+
+                if grams is None:
+                    unindexed.append(matcher)
+                    continue
+
+                # Smallest first so the intersection shrinks as fast as it can
+                candidates = sorted(
+                    (self.ngrams.get(gram, set()) for gram in grams), key=len
+                )
+                hwnds = set.intersection(*candidates) if candidates[0] else set()
+
+                for hwnd in sorted(hwnds, key=self.position.__getitem__):
+                    entry = self.entries[hwnd]
+
+                    if matcher.matchesTitle(entry.title):
+                        found[matcher].append(entry)
+
+            if unindexed:
+                for entry in self.order:
+                    for matcher in unindexed:
+                        if matcher.matchesTitle(entry.title):
+                            found[matcher].append(entry)
+
+            return found
+
+
+windowRegistry = WindowRegistry()
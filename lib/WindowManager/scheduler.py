@@ -0,0 +1,198 @@
+import logging
+
+from heapq import heappop, heappush
+from itertools import count
+from threading import Condition, Event, Thread
+from time import monotonic
+from typing import Callable
+
+
+# scheduler
+#   - one thread, one heap of (when, order, task), monotonic clock
+#   - a task is a callback plus optionally
+#       - interval: run again this long after it last ran
+#       - stopCheck: checked before every run, True finishes the task
+#       - timeout: finishes the task (didTimeout) no matter what
+#   - cancelling just marks the task, the heap drops it when it surfaces
+#   - callbacks run on the scheduler thread, keep them short and never sleep in them
+
+
+class ScheduledTask:
+    callback: Callable[[], None]
+    interval: float | None
+    stopCheck: Callable[[], bool] | None
+    deadline: float | None
+    didTimeout: bool
+
+    def __init__(
+        self,
+        scheduler: "Scheduler",
+        callback: Callable[[], None],
+        interval: float | None,
+        stopCheck: Callable[[], bool] | None,
+        deadline: float | None,
+        onDone: Callable[["ScheduledTask"], None] | None,
+    ):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.interval = interval
+        self.stopCheck = stopCheck
+        self.deadline = deadline
+        self.onDone = onDone
+
+        self.didTimeout = False
+        self.doneFlag = Event()
+
+    def cancel(self):
+        self.scheduler.cancel(self)
+
+    def isDone(self):
+        return self.doneFlag.is_set()
+
+    def join(self, timeout: float = None):
+        return self.doneFlag.wait(timeout)
+
+    def finish(self, didTimeout: bool = False) -> bool:
+        """
+        False if something else got here first
+        """
+
+        with self.scheduler.condition:
+            if self.doneFlag.is_set():
+                return False
+
+            self.didTimeout = didTimeout
+            self.doneFlag.set()
+
+        if self.onDone is not None:
+            try:
+                self.onDone(self)
+            except Exception:
+                logger.exception(f"onDone failed for {self}")
+
+        return True
+
+    def __repr__(self):
+        return f"ScheduledTask(callback={self.callback}, interval={self.interval})"
+
+
+class Scheduler:
+    """
+    Timers and repeating ticks for the whole process on a single thread
+
+    ex: task = scheduler.every(0.5, poll, stopCheck=lambda: found.is_set(), timeout=10)
+        scheduler.callLater(1, lambda: print("a second later"))
+        task.cancel()  # returns right away, nothing to wait out
+    """
+
+    heap: list[tuple[float, int, ScheduledTask]]
+
+    def __init__(self, name: str = "Window-Scheduler"):
+        self.name = name
+
+        self.heap = list()
+        self.order = count()
+        self.condition = Condition()
+        self.thread: Thread | None = None
+
+    def schedule(
+        self,
+        callback: Callable[[], None],
+        delay: float = 0.0,
+        interval: float = None,
+        stopCheck: Callable[[], bool] = None,
+        timeout: float = None,
+        onDone: Callable[[ScheduledTask], None] = None,
+    ) -> ScheduledTask:
+        now = monotonic()
+
+        task = ScheduledTask(
+            self,
+            callback,
+            interval,
+            stopCheck,
+            now + timeout if timeout is not None else None,
+            onDone,
+        )
+
+        self.__push(task, now + delay)
+        return task
+
+    def callLater(self, delay: float, callback: Callable[[], None]) -> ScheduledTask:
+        return self.schedule(callback, delay)
+
+    def every(
+        self,
+        interval: float,
+        callback: Callable[[], None],
+        stopCheck: Callable[[], bool] = None,
+        timeout: float = None,
+        onDone: Callable[[ScheduledTask], None] = None,
+    ) -> ScheduledTask:
+        # First run right away, same as the old EventLoop threads
+        return self.schedule(callback, 0.0, interval, stopCheck, timeout, onDone)
+
+    def cancel(self, task: ScheduledTask):
+        if task.finish():
+            # Wake the thread so a cancelled head of the heap gets dropped now
+            with self.condition:
+                self.condition.notify()
+
+    def __push(self, task: ScheduledTask, when: float):
+        # A timeout has to fire on time even if the next tick is further out
+        if task.deadline is not None:
+            when = min(when, task.deadline)
+
+        with self.condition:
+            heappush(self.heap, (when, next(self.order), task))
+
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = Thread(target=self.__run, name=self.name, daemon=True)
+                self.thread.start()
+
+            self.condition.notify()
+
+    def __next(self) -> ScheduledTask:
+        with self.condition:
+            while True:
+                while self.heap and self.heap[0][2].isDone():
+                    heappop(self.heap)
+
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+
+                wait = self.heap[0][0] - monotonic()
+                if wait > 0:
+                    self.condition.wait(wait)
+                    continue
+
+                return heappop(self.heap)[2]
+
+    def __run(self):
+        while True:
+            task = self.__next()
+            now = monotonic()
+
+            if task.deadline is not None and now >= task.deadline:
+                task.finish(didTimeout=True)
+                continue
+
+            try:
+                if task.stopCheck is not None and task.stopCheck():
+                    task.finish()
+                    continue
+
+                task.callback()
+            except Exception:
+                logger.exception(f"Scheduled callback failed, {task}")
+
+            if task.interval is None:
+                task.finish()
+            elif not task.isDone():
+                self.__push(task, now + task.interval)
+
+
+scheduler = Scheduler()
+
+logger = logging.getLogger("Scheduler")
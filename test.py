@@ -3,8 +3,7 @@ import win32gui
 import logging
 import subprocess
 
-import keyboard
-
+from lib.Shortcuts.InputBackend import KeyboardBackend
 from lib.Shortcuts.ShortcutManager import ManagerOptions, ShortcutManager
 from lib.Shortcuts.Shortcut import Shortcut
 
@@ -19,6 +18,9 @@ logging.getLogger("Shortcut").setLevel(logging.DEBUG)
 
 logging.getLogger("HotkeyWindow").setLevel(logging.DEBUG)
 
+# Swap for a FakeBackend to run these without a desktop
+keyboard = KeyboardBackend()
+
 
 lorem = """
 Nostrud ullamco in reprehenderit occaecat minim exercitation proident ea est. 
@@ -113,7 +115,7 @@ class Navigation:
 
 def main():
     manager: ShortcutManager = ShortcutManager(
-        "ctrl+up", options=ManagerOptions(requireFullPath=True)
+        "ctrl+up", options=ManagerOptions(requireFullPath=True), backend=keyboard
     )
     manager.addShortcut(
         Shortcut(
@@ -152,7 +154,7 @@ def main():
         )
     )
 
-    ShortcutManager.wait()
+    ShortcutManager.wait(backend=keyboard)
 
 
 main()
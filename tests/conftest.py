@@ -0,0 +1,22 @@
+import pytest
+
+from lib.Shortcuts.InputBackend import FakeBackend
+from lib.Shortcuts.ShortcutManager import ManagerOptions, ShortcutManager
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def manager(backend):
+    manager = ShortcutManager(
+        "ctrl+up",
+        backend=backend,
+        options=ManagerOptions(
+            headless=True, addDummyShortcut=False, requireFullPath=True
+        ),
+    )
+    yield manager
+    manager.shutdown()
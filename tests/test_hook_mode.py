@@ -0,0 +1,135 @@
+import time
+
+from threading import Event
+
+import pytest
+
+from lib.Shortcuts.Shortcut import Shortcut
+from lib.Shortcuts.ShortcutManager import ManagerOptions, ShortcutManager
+
+
+@pytest.fixture
+def makeManager(backend):
+    managers = list()
+
+    def make(onBreakout=lambda: (), **options):
+        manager = ShortcutManager(
+            "ctrl+up",
+            backend=backend,
+            onBreakout=onBreakout,
+            options=ManagerOptions(
+                headless=True,
+                addDummyShortcut=False,
+                requireFullPath=True,
+                hookMode="hook",
+                **options,
+            ),
+        )
+        managers.append(manager)
+        return manager
+
+    yield make
+
+    for manager in managers:
+        manager.shutdown()
+
+
+def passedSince(backend, start: int):
+    return [(event.name, event.event_type) for event in backend.passed[start:]]
+
+
+def test_hook_mode_routes_a_multi_step_chord(backend, makeManager):
+    manager = makeManager()
+    top, word = Event(), Event()
+    manager.addShortcut(Shortcut(["g", "g"], top.set))
+    manager.addShortcut(Shortcut(["v", "w"], word.set))
+
+    # One hook for everything, nothing registered per key
+    assert len(backend.hooks) == 1
+    assert not backend.hotkeys
+
+    for hotkey in ["ctrl+up", "v", "w"]:
+        backend.tap(hotkey)
+
+    assert word.wait(1)
+    assert not top.is_set()
+
+
+def test_hook_mode_only_suppresses_keys_in_the_chord(backend, makeManager):
+    manager = makeManager()
+    manager.addShortcut(Shortcut(["g", "g"], lambda: None))
+
+    # Idle, only the command key is routed
+    start = len(backend.passed)
+    backend.tap("g")
+    assert passedSince(backend, start) == [("g", "down"), ("g", "up")]
+
+    start = len(backend.passed)
+    backend.tap("ctrl+up")
+    # Passes through like add_hotkey would
+    assert ("up", "down") in passedSince(backend, start)
+
+    start = len(backend.passed)
+    backend.tap("x")
+    backend.tap("g")
+    # Press and release of g both swallowed, x isn't part of the chord
+    assert passedSince(backend, start) == [("x", "down"), ("x", "up")]
+
+
+def test_hook_mode_modifier_chords(backend, makeManager):
+    manager = makeManager()
+    ran = Event()
+    manager.addShortcut(Shortcut(["shift+g", "x"], ran.set))
+
+    backend.tap("ctrl+up")
+
+    start = len(backend.passed)
+    backend.tap("g")
+    # Plain g isn't shift+g
+    assert passedSince(backend, start) == [("g", "down"), ("g", "up")]
+
+    start = len(backend.passed)
+    backend.tap("shift+g")
+    # Shift itself goes through, the g it modified doesn't
+    assert passedSince(backend, start) == [("left shift", "down"), ("left shift", "up")]
+
+    backend.tap("x")
+    assert ran.wait(1)
+
+
+def test_hook_mode_breakout_resets_the_table(backend, makeManager):
+    brokeOut = Event()
+    manager = makeManager(onBreakout=brokeOut.set)
+    ran = Event()
+    manager.addShortcut(Shortcut(["g", "g"], ran.set))
+
+    backend.tap("ctrl+up")
+    backend.tap("g")
+    backend.tap("esc")
+    assert brokeOut.is_set()
+
+    # Back to idle, g is the user's again
+    start = len(backend.passed)
+    backend.tap("g")
+    assert passedSince(backend, start) == [("g", "down"), ("g", "up")]
+    assert not ran.wait(0.2)
+
+
+def test_hook_mode_timeout_resets_the_table(backend, makeManager):
+    manager = makeManager(chordTimeout=0.1)
+    ran = Event()
+    manager.addShortcut(Shortcut(["g", "g"], ran.set))
+
+    backend.tap("ctrl+up")
+    backend.tap("g")
+    time.sleep(0.3)
+
+    start = len(backend.passed)
+    backend.tap("g")
+    assert passedSince(backend, start) == [("g", "down"), ("g", "up")]
+    assert not ran.wait(0.2)
+
+    # Keys inside the timeout keep the chord going
+    for hotkey in ["ctrl+up", "g", "g"]:
+        backend.tap(hotkey)
+    assert ran.wait(1)
@@ -0,0 +1,59 @@
+from threading import Event
+
+from lib.Shortcuts.Shortcut import Shortcut
+
+
+def test_parse_hotkey_flattens_a_parsed_single_step_like_keyboard(backend):
+    parsed = backend.parseHotkey("shift+g")
+
+    assert len(parsed[0]) == 2
+    # keyboard.parse_hotkey treats a length 1 tuple as one flat group of keys
+    assert backend.parseHotkey(parsed) == ((parsed[0][0] + parsed[0][1],),)
+
+
+def test_chord_hotkey_needs_every_key(backend):
+    fired = list()
+    backend.addHotkey("shift+g", lambda: fired.append("shift+g"))
+
+    backend.tap("shift")
+    backend.tap("g")
+    assert fired == []
+
+    backend.tap("shift+g")
+    assert fired == ["shift+g"]
+
+
+def test_manager_registers_chords_through_the_backend(backend, manager):
+    ran = Event()
+    manager.addShortcut(Shortcut(["shift+g", "shift+g"], ran.set))
+
+    # Neither half of the command key starts a chord
+    backend.tap("ctrl")
+    backend.tap("up")
+    backend.tap("shift+g")
+    backend.tap("shift+g")
+    assert not ran.wait(0.2)
+
+    backend.tap("ctrl+up")
+    # Nor does either half of a path key move it along
+    backend.tap("shift")
+    backend.tap("g")
+    assert not ran.wait(0.2)
+
+    backend.tap("shift+g")
+    backend.tap("shift+g")
+    assert ran.wait(1)
+
+
+def test_chords_are_parsed_when_added_not_on_the_keyboard_thread(backend, manager):
+    ran = Event()
+    manager.addShortcut(Shortcut(["shift+g", "x"], ran.set))
+
+    parsed = dict(manager.chords)
+    assert {"shift+g", "x"} <= parsed.keys()
+
+    for hotkey in ["ctrl+up", "shift+g", "x"]:
+        backend.tap(hotkey)
+    assert ran.wait(1)
+
+    assert manager.chords == parsed
@@ -0,0 +1,33 @@
+from lib.WindowManager import SimulatedDesktop, setBackend
+from lib.WindowManager.managers import searchForWindowsMatching
+from lib.WindowManager.matchers import TitleMatcher
+
+
+def test_none_keyword_matches_every_title_in_every_mode():
+    for mode in ("substring", "exact", "regex"):
+        matcher = TitleMatcher(None, mode=mode, exePath="notepad")
+
+        assert matcher.matchesTitle("Untitled - Notepad")
+        assert matcher.ngrams() is None
+
+
+def test_regex_and_ignore():
+    matcher = TitleMatcher(r"^Untitled - ", ignore="Notepad++", mode="regex")
+
+    assert matcher.matchesTitle("Untitled - Notepad")
+    assert not matcher.matchesTitle("Untitled - Notepad++")
+    assert not matcher.matchesTitle("Notes")
+
+
+def test_matching_search_reads_live_titles_by_default():
+    desktop = SimulatedDesktop(windows=3)
+    setBackend(desktop)
+
+    hwnd = desktop.enumWindows()[0]
+    matcher = TitleMatcher("Renamed just now")
+
+    # Warm the registry so a cached read would still have the old title
+    searchForWindowsMatching([matcher], cached=True)
+    desktop.setTitle(hwnd, "Renamed just now")
+
+    assert [window.hwnd for window in searchForWindowsMatching([matcher])[matcher]] == [hwnd]
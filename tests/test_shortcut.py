@@ -0,0 +1,9 @@
+from lib.Shortcuts.Shortcut import Shortcut
+
+
+def test_running_a_shortcut_leaves_the_label_unbuilt():
+    shortcut = Shortcut(["g", "g"], lambda: None)
+    shortcut.run()
+
+    assert shortcut.customLabel is None
+    assert shortcut.label == "g ->g"
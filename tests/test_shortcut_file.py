@@ -0,0 +1,126 @@
+import json
+import sys
+import time
+
+from threading import Event, Thread
+
+from lib.Shortcuts.Shortcut import Shortcut
+from lib.Shortcuts.ShortcutFile import ShortcutFile, parseEntries
+
+
+def test_list_form_allows_keys_with_spaces():
+    source = b"""
+[shortcuts]
+"g g" = "top"
+
+[[shortcut]]
+path = ["page up", "g"]
+action = "top"
+label = "Top"
+"""
+
+    assert parseEntries("a.toml", source) == {
+        ("g", "g"): ("top", (), None),
+        ("page up", "g"): ("top", (), "Top"),
+    }
+
+
+def test_loading_the_same_file_twice_doesnt_double_up(tmp_path, backend, manager):
+    path = tmp_path / "shortcuts.toml"
+    path.write_text('[[shortcut]]\npath = ["page up", "g"]\naction = "top"\n')
+
+    ran = Event()
+    manager.load(str(path), {"top": ran.set})
+    manager.load(str(path), {"top": ran.set})
+
+    assert manager.pathIndex.root.count == 1
+
+    backend.tap("ctrl+up")
+    backend.tap("page up")
+    backend.tap("g")
+    assert ran.wait(1)
+
+
+def test_toml_cache_is_plain_json_and_reused(tmp_path):
+    path = tmp_path / "shortcuts.toml"
+    path.write_text('[shortcuts]\n"p 5" = { action = "press", args = ["down", 5] }\n')
+    actions = {"press": lambda key, times: (key, times)}
+
+    first = ShortcutFile.read(str(path), actions)
+    cached = json.loads((tmp_path / "shortcuts.toml.cache").read_text())
+    second = ShortcutFile.read(str(path), actions)
+
+    assert cached["entries"] == [[["p", "5"], "press", ["down", 5], None]]
+    assert not first.fromCache and second.fromCache
+    assert second.shortcuts[("p", "5")].run() == ("down", 5)
+
+
+def test_json_files_are_not_cached(tmp_path):
+    path = tmp_path / "shortcuts.json"
+    path.write_text(json.dumps({"shortcuts": {"g g": "top"}}))
+
+    for _ in range(2):
+        assert not ShortcutFile.read(str(path), {"top": lambda: None}).fromCache
+
+    assert not (tmp_path / "shortcuts.json.cache").exists()
+
+
+def test_watch_reuses_the_loaded_file_and_reloads_on_the_pool(tmp_path, backend, manager):
+    path = tmp_path / "shortcuts.toml"
+    path.write_text('[shortcuts]\n"g g" = "top"\n')
+
+    ran = list()
+    actions = {"top": lambda: ran.append("top"), "bottom": lambda: ran.append("bottom")}
+    loaded = manager.load(str(path), actions)
+    task = manager.watch(str(path), actions, interval=0.05)
+
+    assert manager.shortcutFile is loaded
+    assert manager.pathIndex.root.count == 1
+
+    path.write_text('[shortcuts]\n"g g" = "bottom"\n"b b" = "bottom"\n')
+    for _ in range(40):
+        if manager.pathIndex.root.count == 2:
+            break
+        time.sleep(0.05)
+
+    task.cancel()
+    assert manager.pathIndex.root.count == 2
+
+    for hotkey in ["ctrl+up", "g", "g"]:
+        backend.tap(hotkey)
+
+    for _ in range(20):
+        if ran:
+            break
+        time.sleep(0.05)
+    assert ran == ["bottom"]
+
+
+def test_add_shortcut_during_reloads_keeps_every_shortcut(tmp_path, manager):
+    path = tmp_path / "shortcuts.toml"
+    path.write_text('[shortcuts]\n"g g" = "top"\n')
+    manager.load(str(path), {"top": lambda: None})
+
+    def addMany():
+        for index in range(300):
+            manager.addShortcut(Shortcut(["x", str(index)], lambda: None))
+
+    # Switch threads as often as possible so the two actually interleave
+    switchInterval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    try:
+        adder = Thread(target=addMany)
+        adder.start()
+
+        for index in range(300):
+            path.write_text(f'[shortcuts]\n"g g" = "top"\n"r {index}" = "top"\n')
+            manager.reload()
+
+        adder.join()
+    finally:
+        sys.setswitchinterval(switchInterval)
+
+    index = manager.pathIndex
+    assert index.root.count == 2 + 300
+    assert index.step(index.root, "x").count == 300
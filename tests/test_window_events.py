@@ -0,0 +1,33 @@
+import pytest
+
+from lib.WindowManager import SimulatedDesktop, setBackend, windowEvents
+
+
+@pytest.fixture
+def desktop():
+    desktop = SimulatedDesktop(windows=3)
+    setBackend(desktop)
+    return desktop
+
+
+def test_same_subscription_twice_is_one(desktop):
+    first = windowEvents.subscribe("foreground", print)
+
+    try:
+        assert windowEvents.subscribe("foreground", print) is first
+    finally:
+        first.stop()
+
+
+def test_once_and_timeout_are_part_of_the_subscription(desktop):
+    forever = windowEvents.subscribe("foreground", print)
+    once = windowEvents.subscribe("foreground", print, once=True)
+    timed = windowEvents.subscribe("foreground", print, timeout=10)
+
+    try:
+        assert len({id(forever), id(once), id(timed)}) == 3
+        assert once.once and not forever.once
+        assert timed.timeout == 10
+    finally:
+        for subscription in (forever, once, timed):
+            subscription.stop()
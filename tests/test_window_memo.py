@@ -0,0 +1,37 @@
+import pytest
+
+from lib.WindowManager import (
+    SimulatedDesktop,
+    getForegroundWindowAsObject,
+    setBackend,
+    windowMemo,
+)
+
+
+@pytest.fixture
+def desktop():
+    desktop = SimulatedDesktop(windows=3)
+    setBackend(desktop)
+    return desktop
+
+
+def test_foreground_title_is_never_stale(desktop):
+    first = getForegroundWindowAsObject()
+    title = first.windowTitle
+
+    desktop.setTitle(first.hwnd, "Renamed")
+
+    assert getForegroundWindowAsObject().windowTitle == "Renamed"
+    # Whoever held on to the old Window keeps what it read
+    assert first.windowTitle == title
+
+
+def test_exe_path_is_read_once_per_window(desktop):
+    hwnd = getForegroundWindowAsObject().hwnd
+    getForegroundWindowAsObject().exePath
+    opened = desktop.calls["openProcess"]
+
+    assert getForegroundWindowAsObject().exePath == windowMemo.exePathFor(
+        hwnd, *desktop.getWindowThreadProcessId(hwnd)
+    )
+    assert desktop.calls["openProcess"] == opened
@@ -0,0 +1,67 @@
+import time
+
+from threading import Event
+
+from lib.Shortcuts.WorkerPool import WorkerPool
+
+
+def test_spawn_runs_past_a_full_queue():
+    pool = WorkerPool(workers=2, queueSize=1, backpressure="spawn")
+    release = Event()
+    ran = Event()
+
+    try:
+        # Like two subprocess.run("notepad.exe") shortcuts still open
+        for _ in range(2):
+            assert pool.submit(release.wait)
+            time.sleep(0.05)
+
+        # Queued first, only a full queue spawns
+        assert pool.submit(release.wait)
+        assert pool.spawned == 0
+
+        assert pool.submit(ran.set)
+        assert ran.wait(1)
+        assert pool.spawned == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_spawn_is_capped_and_joined_on_shutdown():
+    pool = WorkerPool(workers=2, queueSize=4, backpressure="spawn", maxSpawned=3)
+    release = Event()
+
+    try:
+        for _ in range(2):
+            assert pool.submit(release.wait)
+            time.sleep(0.05)
+
+        submitted = [pool.submit(release.wait) for _ in range(498)]
+
+        # 2 running, 4 queued, 3 spawned, the rest dropped
+        assert submitted.count(True) == 7
+        assert pool.spawned == 3
+        assert pool.dropped == 491
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert not any(thread.is_alive() for thread in pool.workers + pool.overflow)
+
+
+def test_drop_is_the_default():
+    pool = WorkerPool(workers=1, queueSize=1)
+    release = Event()
+
+    try:
+        assert pool.submit(release.wait)
+        time.sleep(0.05)
+        assert pool.submit(release.wait)
+
+        assert not pool.submit(release.wait)
+        assert pool.dropped == 1
+        assert pool.spawned == 0
+    finally:
+        release.set()
+        pool.shutdown()